@@ -6,12 +6,68 @@ from app.services.council import council_service
 from app.services.qdrant import qdrant_service
 from app.services.db import db_service
 from app.api.deps import get_current_user
+from app.config import settings
 from app.logger import logger
 import json
 import asyncio
+import uuid
 
 router = APIRouter()
 
+# Chat-turn DB writes run off the request path; this caps how many can be outstanding
+_persist_sem = asyncio.Semaphore(settings.DB_BACKGROUND_WRITES_MAX)
+_persist_tasks: set = set()  # Strong references so pending writes are not garbage collected
+_conversation_writes: dict = {}  # conversation_id -> set of its writes still in flight
+
+async def _bg_persist(fn, *args, after: asyncio.Task = None, **kwargs):
+    """Runs a blocking db_service call in a worker thread, logging (not raising) failures (the task then returns None)"""
+    if after is not None:
+        # e.g. the assistant reply must not land before the RPC that creates its conversation
+        await asyncio.wait([after])
+        if after.cancelled() or after.result() is None:
+            # Its conversation may not exist (or not be this user's): the insert could only fail
+            logger.warning(f"[Persist] Skipping background {fn.__name__}: the write it depends on failed")
+            return None
+    try:
+        async with _persist_sem:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+    except Exception as e:
+        logger.error(f"[Persist] Background {fn.__name__} failed: {e}")
+
+def _persist_in_background(fn, *args, conversation: str = None, **kwargs) -> asyncio.Task:
+    task = asyncio.create_task(_bg_persist(fn, *args, **kwargs))
+    _persist_tasks.add(task)
+    task.add_done_callback(_persist_tasks.discard)
+    if conversation:
+        # Tracked so the conversation's next request can wait for it before reading history
+        writes = _conversation_writes.setdefault(conversation, set())
+        writes.add(task)
+
+        def forget(done):
+            writes.discard(done)
+            if not writes and _conversation_writes.get(conversation) is writes:
+                del _conversation_writes[conversation]
+        task.add_done_callback(forget)
+    return task
+
+async def _settle_conversation_writes(conversation_id: str):
+    """Waits for the conversation's earlier background and batched writes, so its history is complete"""
+    writes = _conversation_writes.get(conversation_id)
+    if writes:
+        await asyncio.wait(list(writes))
+    if db_service.has_queued_messages(conversation_id):
+        await asyncio.to_thread(db_service.wait_for_queued_messages, conversation_id)
+
+async def _direct_answer_events(answer: str):
+    """Stream events for a canned reply, in the shape deliberate_stream ends with"""
+    yield "log: ✓ Answered directly (no legal research needed)\n"
+    yield f"data: {json.dumps({'answer': answer})}\n"
+
+async def drain_background_writes():
+    """Waits for outstanding chat-turn writes (called on shutdown, before the DB queue is flushed)"""
+    if _persist_tasks:
+        await asyncio.wait(list(_persist_tasks))
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
@@ -21,24 +77,26 @@ async def chat(
     try:
         logger.info(f" New chat request from {user_id}: {request.query[:100]}...")
         
-        # 1. Create/Get Conversation
-        conversation_id = request.conversation_id
-        if not conversation_id:
-            conversation_id = db_service.create_conversation(user_id, title=request.query[:50])
-            
-        # 2. Log User Message
-        db_service.add_message(
+        # 1-2. Log User Message (creates the conversation if needed, in the same round trip)
+        conversation_id = request.conversation_id or str(uuid.uuid4())
+        user_write = _persist_in_background(
+            db_service.append_message_ensure_conv,
+            conversation=conversation_id,
             conversation_id=conversation_id,
             user_id=user_id,
             role="user",
-            content=request.query
+            content=request.query,
+            title=request.query[:50]
         )
 
         # 3. Process Query
         response = await rag_service.process_query(request.query, request.top_k)
         
-        # 4. Log Assistant Response
-        db_service.add_message(
+        # 4. Log Assistant Response (batched in the background)
+        _persist_in_background(
+            db_service.enqueue_message,
+            after=user_write,
+            conversation=conversation_id,
             conversation_id=conversation_id,
             user_id=user_id,
             role="assistant",
@@ -118,57 +176,57 @@ async def stream_chat(
             is_web_search_enabled = str(web_search).lower() == "true"
             actual_window_size = (max(1, min(50, int(context_window))) * 2) + 1
 
-            # Check history for Retry/Regen logic
-            history_for_check = db_service.get_conversation_history(conv_id, user_id, limit=2)
+            # Fetch Context History once (one spare row in case regeneration drops the last reply);
+            # the writes below go to the background and are mirrored locally instead of re-read.
+            # A previous turn's writes may still be in flight: let them land first so the tail is current.
+            history = []
+            if conv_id:
+                await _settle_conversation_writes(conv_id)
+                history = await asyncio.to_thread(db_service.get_conversation_history, conv_id, user_id, limit=actual_window_size + 1)
             should_add_user_msg = True
+            user_write = None
             
-            if history_for_check:
-                last_msg = history_for_check[-1]
+            # Check history for Retry/Regen logic
+            if history:
+                last_msg = history[-1]
                 # Regeneration Logic
-                if last_msg.get('role') == 'assistant' and len(history_for_check) >= 2:
-                    prev_msg = history_for_check[-2]
+                if last_msg.get('role') == 'assistant' and len(history) >= 2:
+                    prev_msg = history[-2]
                     if prev_msg.get('role') == 'user' and prev_msg.get('content') == query:
                         logger.info(f"[Stream] Regeneration detected. Deleting last response...")
-                        db_service.delete_message(last_msg['id'])
+                        _persist_in_background(db_service.delete_message, last_msg['id'], conversation=conv_id)
+                        history.pop()
                         should_add_user_msg = False
                 # Retry Logic
                 elif last_msg.get('role') == 'user' and last_msg.get('content') == query:
                      logger.info(f"[Stream] Retry detected. Reusing user message.")
                      should_add_user_msg = False
 
-            # Add User Message to DB
-            try:
-                if should_add_user_msg:
-                    if not conv_id:
-                         # Create new conversation if needed
-                         title = query[:50] + "..." if len(query) > 50 else query
-                         conv_id = db_service.create_conversation(user_id, title=title)
-                    
-                    db_service.add_message(conv_id, user_id, "user", query)
-            except Exception as e:
-                # Fallback for FK errors
-                # Fallback for FK errors
-                 if "foreign key" in str(e) or "23503" in str(e) or not conv_id:
-                    # Create with the REQUESTED ID if it exists, otherwise it will generate one
-                    conv_id = db_service.create_conversation(user_id, title=query[:50], id=conv_id)
-                    db_service.add_message(conv_id, user_id, "user", query)
-                 else:
-                    raise e
-            
-            # Fetch Context History
-            history = db_service.get_conversation_history(conv_id, user_id, limit=actual_window_size)
+            # Add User Message to DB (creates the conversation with the requested ID if needed)
+            if should_add_user_msg:
+                conv_id = conv_id or str(uuid.uuid4())
+                title = query[:50] + "..." if len(query) > 50 else query
+                user_write = _persist_in_background(db_service.append_message_ensure_conv, conv_id, user_id, "user", query, title=title, conversation=conv_id)
+                history.append({"role": "user", "content": query})
+            history = history[-actual_window_size:]
             
             # 2. Delegate to Council Service
-            # The service now handles Clerk, Retrieval, and Deliberation internally
+            # The service now handles Clerk, Retrieval, and Deliberation internally;
+            # small talk ("hi", "thanks") and degenerate queries get a canned reply without it
+            canned = rag_service.direct_answer(query)
+            if canned:
+                events = _direct_answer_events(canned)
+            else:
+                events = council_service.deliberate_stream(
+                    query=query, 
+                    chat_history=history, 
+                    enable_web_search=is_web_search_enabled,
+                    conv_id=conv_id,
+                    context_window_size=int(context_window),
+                    mode=mode  # User's slider value
+                )
             
-            async for event in council_service.deliberate_stream(
-                query=query, 
-                chat_history=history, 
-                enable_web_search=is_web_search_enabled,
-                conv_id=conv_id,
-                context_window_size=int(context_window),
-                mode=mode  # User's slider value
-            ):
+            async for event in events:
                 clean_event = event.strip()
                 
                 # --- Event Handling & Logging ---
@@ -208,12 +266,15 @@ async def stream_chat(
                 "council_opinions": stream_opinions
             }
             
-            db_service.add_message(
+            _persist_in_background(
+                db_service.enqueue_message,
                 conv_id, 
                 user_id, 
                 "assistant", 
                 final_content or "[No Response]",
-                metadata=metadata
+                metadata=metadata,
+                after=user_write,
+                conversation=conv_id
             )
 
         except asyncio.CancelledError:
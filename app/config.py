@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     QDRANT_API_KEY: str
     QDRANT_COLLECTION_STATUTES: str = "indian_legal_docs"
     QDRANT_COLLECTION_CASES: str = "supreme_court_cases"
+    QDRANT_PREFER_GRPC: bool = False  # Opt-in: persistent multiplexed gRPC channel (port 6334) instead of REST; falls back to REST if unreachable
     
     # Gemini
     GEMINI_API_KEY: str
@@ -30,6 +31,10 @@ class Settings(BaseSettings):
     # Supabase
     SUPABASE_URL: str
     SUPABASE_SERVICE_KEY: str
+    DB_WRITE_BATCH_MS: int = 50  # Max wait before flushing queued message inserts
+    DB_WRITE_BATCH_SIZE: int = 100  # Max rows per batched insert
+    DB_BACKGROUND_WRITES_MAX: int = 64  # Max chat-turn DB writes in flight off the request path
+    DB_CREATED_AT_TRACK_MAX: int = 10000  # Conversations whose last message timestamp is remembered (LRU) to keep created_at increasing
 
     # Prompts
     PROMPT_CLERK: str = """
@@ -109,6 +114,20 @@ class Settings(BaseSettings):
     # RAG Configuration
     RAG_TOP_K: int = 5  # Number of documents to retrieve from vector DB
     RAG_SCORE_THRESHOLD: float = 0.0  # Minimum similarity score (0.0 = no filtering)
+    SPECULATIVE_RETRIEVAL: bool = True  # Search with the raw query while the Clerk classifies it
+    QDRANT_CACHE_MAX_SIZE: int = 2048  # Shared search-result cache across all users
+    QDRANT_CACHE_TTL_SECONDS: int = 600
+    EMBEDDING_CACHE_MAX_SIZE: int = 4000  # Query embeddings reused across searches (float16, ~4 KB each: ~16 MB; raise on bigger hosts)
+    EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    EMBEDDING_CACHE_PATH: str = ""  # Snapshot kept across restarts; set to a path on a mounted volume (e.g. /data/embedding_cache) to enable
+    RESPONSE_CACHE_MAX_SIZE: int = 2000  # Final non-streaming answers (POST /chat)
+    RESPONSE_CACHE_TTL_SECONDS: int = 1800
+    RESPONSE_CACHE_SIMILARITY: float = 1.01  # Reuse an answer for a query this close in embedding space and citing the same numbers (> 1 disables; opt in with e.g. 0.97)
+    RETRIEVAL_CACHE_TTL_SECONDS: int = 900  # Reuse a conversation's search results for 15 minutes
+    RETRIEVAL_CACHE_MAX_ENTRIES: int = 512
+    DIRECT_MIN_QUERY_CHARS: int = 3  # Shorter queries get a canned reply (/chat and /stream), no retrieval or LLM calls
+    DIRECT_MAX_QUERY_CHARS: int = 4000
+    QDRANT_KEEP_RAW_PAYLOAD: bool = False  # Debug: attach the raw Qdrant payload to chunk metadata as 'full_metadata'
     
     # LLM Temperature Settings
     TEMPERATURE_CLERK: float = 0.3  # Low for structured routing
@@ -116,10 +135,32 @@ class Settings(BaseSettings):
     TEMPERATURE_COUNCIL: float = 0.7  # Balanced for deliberation
     TEMPERATURE_CHAIRMAN: float = 0.7  # Balanced for synthesis
     
+    # Gemini Request Limits
+    GEMINI_TIMEOUT_MEMBER: float = 30.0  # Seconds per council member attempt
+    GEMINI_TIMEOUT_CHAIRMAN: float = 60.0  # Seconds for Chairman (read timeout when streaming)
+    GEMINI_MAX_RETRIES: int = 2  # Retries on timeouts and 429/503
+    GEMINI_MAX_OUTPUT_TOKENS: int = 2048  # Cap on council member responses
+    GEMINI_INFLIGHT_MAX: int = 256  # Max distinct concurrent requests tracked for de-duplication
+    GEMINI_MAX_CONCURRENCY: int = 16  # Process-wide cap on concurrent Gemini calls (members; streams only while opening)
+    
+    # Token Streaming (coalesce small model chunks into fewer SSE frames)
+    STREAM_FLUSH_CHARS: int = 512
+    STREAM_FLUSH_MS: int = 30
+    
     # Context Window Limits
-    CONTEXT_MAX_CHARS: int = 15000  # Max characters to send to Chairman
+    CONTEXT_MAX_CHARS: int = 15000  # Max context characters (~4 per token) sent to the Chairman and fast/balanced answers
+    MEMBER_CTX_MAX_CHARS_FULL: int = 12000  # Constitutional Expert & Devil's Advocate (statutes + cases)
+    MEMBER_CTX_MAX_CHARS_STATUTE: int = 8000  # Statutory Analyst
+    MEMBER_CTX_MAX_CHARS_CASE: int = 8000  # Case Law Researcher
     # CHAT_HISTORY_LIMIT: int = 5  # DEPRECATED: Controlled dynamically by user slider (using turns)
 
+    # Council Scheduling
+    COUNCIL_SPECULATIVE_CHAIRMAN: bool = True  # Start Chairman once a quorum of opinions is in
+    COUNCIL_SPECULATION_DEFAULT_DELAY: float = 10.0  # Seconds before speculating when no member latency history exists
+    COUNCIL_OPINIONS_MAX_CHARS: int = 12000  # Budget for council opinions sent to Chairman
+    COUNCIL_NOVELTY_THRESHOLD: float = 0.85  # Drop opinion sentences at least this similar to ones already kept
+    COUNCIL_DEVIL_SKIP_SIMILARITY: float = 0.85  # Skip Devil's Advocate when the first two opinions agree this closely (> 1 disables)
+
     # Document Analyzer
     MODEL_ANALYZER: str = "gemini-2.5-flash"
     TEMPERATURE_ANALYZER: float = 0.3
@@ -1,9 +1,14 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.chat import router as chat_router
+from app.api.chat import drain_background_writes, router as chat_router
 from app.api.judgement import router as judgement_router
 from app.api.document import router as document_router
+from app.services.council import council_service
+from app.services.db import db_service
+from app.services.qdrant import qdrant_service
+from app.services.retrieval_cache import embedding_cache, load_embedding_cache, query_cache, save_embedding_cache
 from app.logger import logger
+import asyncio
 import time
 
 app = FastAPI(title="Samvidhaan API", version="3.0.0")
@@ -54,10 +59,18 @@ app.include_router(document_router, prefix="/api")
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"{app.title} starting up...")
+    await asyncio.to_thread(load_embedding_cache)
+    # Connect to Qdrant in the background so the first user doesn't pay the handshake
+    app.state.qdrant_warmup = asyncio.create_task(qdrant_service.warmup())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"{app.title} shutting down...")
+    await council_service.close()
+    await qdrant_service.close()
+    await drain_background_writes()
+    await asyncio.to_thread(db_service.flush_messages)
+    await asyncio.to_thread(save_embedding_cache)
 
 @app.get("/")
 async def root():
@@ -70,3 +83,7 @@ async def version():
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
+
+@app.get("/health/cache")
+async def cache_health():
+    return {"retrieval": query_cache.stats(), "embeddings": embedding_cache.stats()}
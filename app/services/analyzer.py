@@ -1,12 +1,16 @@
 import asyncio
 import httpx
 import json
+import orjson
 from typing import List, Dict, AsyncGenerator
 from app.config import settings
 from app.logger import logger
 from app.services.qdrant import qdrant_service
 
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 class AnalyzerService:
     """
     Two-pass document analysis service.
@@ -32,10 +36,10 @@ class AnalyzerService:
         for attempt in range(self.MAX_RETRIES):
             try:
                 async with httpx.AsyncClient(timeout=60.0) as client:
-                    response = await client.post(url, json=payload)
+                    response = await client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
 
                     if response.status_code == 200:
-                        data = response.json()
+                        data = orjson.loads(response.content)
                         try:
                             return data["candidates"][0]["content"]["parts"][0]["text"]
                         except (KeyError, IndexError):
@@ -73,7 +77,7 @@ class AnalyzerService:
         for attempt in range(self.MAX_RETRIES):
             try:
                 async with httpx.AsyncClient(timeout=120.0) as client:
-                    async with client.stream("POST", url, json=payload) as response:
+                    async with client.stream("POST", url, content=orjson.dumps(payload), headers=_JSON_HEADERS) as response:
                         if response.status_code in (503, 429) and attempt < self.MAX_RETRIES - 1:
                             await response.aread()
                             delay = self.RETRY_DELAYS[attempt]
@@ -93,7 +97,7 @@ class AnalyzerService:
                                 json_str = line[5:].strip()
                                 if not json_str:
                                     continue
-                                data = json.loads(json_str)
+                                data = orjson.loads(json_str)
                                 if "candidates" in data:
                                     candidate = data["candidates"][0]
                                     if "content" in candidate and "parts" in candidate["content"]:
@@ -148,7 +152,6 @@ JSON ARRAY:"""
 
     async def _retrieve_legal_context(self, topics: List[str]) -> tuple[List[Dict], List[Dict]]:
         """Query Qdrant with extracted topics. Returns (statute_chunks, case_chunks)."""
-        loop = asyncio.get_running_loop()
         all_statute_chunks = []
         all_case_chunks = []
         seen_statutes = set()
@@ -157,16 +160,21 @@ JSON ARRAY:"""
         logger.info(f"[Analyzer] ========== QDRANT RETRIEVAL ==========")
         logger.info(f"[Analyzer] Topics to search: {topics}")
 
-        for topic in topics[:3]:  # Max 3 queries to limit context
-            try:
-                logger.info(f"[Analyzer] Searching for topic: '{topic}'")
+        topics = topics[:3]  # Max 3 queries to limit context
+        for topic in topics:
+            logger.info(f"[Analyzer] Searching for topic: '{topic}'")
 
-                statute_results = await loop.run_in_executor(
-                    None, qdrant_service.search_statutes, topic, 3
-                )
-                case_results = await loop.run_in_executor(
-                    None, qdrant_service.search_cases, topic, 3
-                )
+        # All topics embedded in one batch call, then both collections for every topic queried concurrently
+        try:
+            results = await qdrant_service.asearch_statutes_and_cases_many(topics, 3)
+        except Exception as e:
+            results = [e] * len(topics)
+
+        for topic, result in zip(topics, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                statute_results, case_results = result
 
                 logger.info(f"[Analyzer]   → Statutes: {len(statute_results)} results")
                 logger.info(f"[Analyzer]   → Cases: {len(case_results)} results")
@@ -281,9 +289,8 @@ JSON ARRAY:"""
                 yield f"log:   ⚖️ {meta.get('case_name', 'Unknown Case')} (relevance: {chunk.get('score', 0):.0%})\n"
 
         # Send retrieved chunks to frontend
-        all_chunks = statute_chunks + case_chunks
-        for i, c in enumerate(all_chunks, 1):
-            c["rank"] = i
+        # Ranks go on fresh dicts: the chunks themselves are shared with the retrieval cache
+        all_chunks = [{**c, "rank": i} for i, c in enumerate(statute_chunks + case_chunks, 1)]
         if all_chunks:
             yield f"chunks: {json.dumps(all_chunks)}\n"
 
@@ -1,11 +1,14 @@
 import httpx
 import json
+import orjson
 from enum import Enum
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from app.config import settings
 from app.logger import logger
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 class IntentType(str, Enum):
     SEARCH_STATUTES = "search_statutes"
     SEARCH_CASES = "search_cases"
@@ -57,12 +60,12 @@ class ClerkService:
             payload["tools"] = [{"googleSearch": {}}]
 
         async with httpx.AsyncClient(timeout=15.0) as client: # Increased timeout for search
-            response = await client.post(url, json=payload)
+            response = await client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS)
             if response.status_code != 200:
                 logger.error(f"[Clerk] Gemini Error ({response.status_code}): {response.text}")
                 return "{}" # Fail safe
             
-            data = response.json()
+            data = orjson.loads(response.content)
             try:
                 raw_text = data["candidates"][0]["content"]["parts"][0]["text"]
                 
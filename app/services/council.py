@@ -1,6 +1,16 @@
 import asyncio
+import hashlib
 import httpx
-import json
+import logging
+import math
+import orjson
+import random
+import re
+import statistics
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import AsyncExitStack
+from itertools import chain
 from typing import List, Dict, Any
 from app.config import settings
 from app.logger import logger
@@ -8,6 +18,178 @@ from app.services.clerk import clerk_service, IntentType
 from app.services.qdrant import qdrant_service
 from app.models.schemas import ChatMode
 
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"\w+")
+
+def _bag_of_words(text: str) -> tuple:
+    """Returns (term counts, vector norm) for cosine comparisons"""
+    counts = Counter(_WORD_RE.findall(text.lower()))
+    return counts, math.sqrt(sum(c * c for c in counts.values()))
+
+def _cosine(a: tuple, b: tuple) -> float:
+    (a_counts, a_norm), (b_counts, b_norm) = a, b
+    if not a_norm or not b_norm:
+        return 0.0
+    if len(a_counts) > len(b_counts):
+        a_counts, b_counts = b_counts, a_counts
+    return sum(c * b_counts[w] for w, c in a_counts.items() if w in b_counts) / (a_norm * b_norm)
+
+# Constant SSE log frames, built once instead of per request
+_LOG_STEP1 = "log: [STEP 1/4] Clerk analyzing query intent...\n"
+_LOG_NON_LEGAL = "log: ✓ Clerk classified as NON-LEGAL query\n"
+_LOG_DIRECT_WEB = "log: Web Search: ENABLED (using Gemini's grounding)\n"
+_LOG_DIRECT_ANSWER = "log: Generating direct response (bypassing legal council)...\n"
+_LOG_LEGAL = "log: ✓ Clerk classified as LEGAL query\n"
+_LOG_WEB_ON = "log: Web Search: ENABLED (Gemini grounding active)\n"
+_LOG_WEB_OFF = "log: Web Search: DISABLED (using local database only)\n"
+_LOG_QUERY_OPTIMIZED = "log: Query optimized for better search results\n"
+_LOG_BLANK = "log: \n"
+_LOG_STEP2 = "log: [STEP 2/4] Searching Legal Databases...\n"
+_LOG_CACHE_REUSE = "log: Reusing search results from earlier in this conversation\n"
+_LOG_QUERY_STATUTES = "log: → Querying Statutes database (Indian Penal Code, CrPC, etc.)\n"
+_LOG_QUERY_CASES = "log: → Querying Case Law database (Supreme Court precedents)\n"
+_LOG_VECTOR_SEARCH = "log: Executing parallel vector similarity search...\n"
+_LOG_STEP3_FAST = "log: [STEP 3/3] Generating Fast Answer (Direct Mode)...\n"
+_LOG_FAST_ANSWER = "log: Generating direct response from retrieved documents...\n"
+_LOG_STEP3_BALANCED = "log: [STEP 3/3] Generating Balanced Analysis (Reasoning Mode)...\n"
+_LOG_BALANCED_ANSWER = "log: Analyzing context with Chairman model (One-Shot)...\n"
+_LOG_STEP3_DEEP = "log: [STEP 3/4] Convening AI Legal Council (Deep Mode)...\n"
+_LOG_MEMBER_CONSTITUTIONAL = "log: → Constitutional Expert analyzing fundamental rights & validity\n"
+_LOG_MEMBER_STATUTORY = "log: → Statutory Analyst examining legal provisions & penalties\n"
+_LOG_MEMBER_CASE_LAW = "log: → Case Law Researcher reviewing precedents & judgments\n"
+_LOG_MEMBER_DEVIL = "log: → Devil's Advocate identifying counterarguments & loopholes\n"
+_LOG_AWAITING = "log: Awaiting parallel deliberations...\n"
+_LOG_DEVIL_SKIPPED = "log: ✓ Devil's Advocate not needed (opinions agree)\n"
+_LOG_COUNCIL_FAILED = "log: ✗ Error: Council failed to deliberate\n"
+_LOG_STEP4 = "log: [STEP 4/4] Chairman synthesizing final ruling...\n"
+_LOG_FINAL_RULING = "log: Generating comprehensive legal analysis (Final Ruling)...\n"
+_LOG_COMPLETE = "log: ✓ Complete.\n"
+_LOG_RESPONSE_DONE = "log: ✓ Response generated.\n"
+_LOG_PARSING_FOLLOWUPS = "log: Parsing integrated follow-up questions...\n"
+
+_STREAM_TEXT_RE = re.compile(rb'"text"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def _extract_stream_text(frame: bytes, raw: bool = False):
+    """
+    Pulls candidates[0].content.parts[0].text out of one streamed Gemini frame.
+    Plain text frames skip full JSON parsing; grounding frames (which carry other
+    "text" fields) and anything unexpected go through orjson.
+    With raw=True the text is returned as its JSON-escaped UTF-8 body, never decoded.
+    """
+    if not frame:
+        return b"" if raw else ""
+    if b'"groundingMetadata"' not in frame and b'"thought"' not in frame:
+        match = _STREAM_TEXT_RE.search(frame)
+        if match:
+            if raw:
+                return match.group(1)
+            try:
+                return orjson.loads(b'"' + match.group(1) + b'"')
+            except orjson.JSONDecodeError:
+                pass
+    try:
+        data = orjson.loads(frame)
+        text = data["candidates"][0]["content"]["parts"][0].get("text", "")
+    except (orjson.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError):
+        text = ""
+    return orjson.dumps(text)[1:-1] if raw else text
+
+_HIGH_SURROGATE_RE = re.compile(rb"\\u[dD][89abAB][0-9a-fA-F]{2}")
+
+def _starts_escape(buf: bytes, backslash: int) -> bool:
+    """True if the backslash at `backslash` begins an escape (is not itself escaped)"""
+    run_start = backslash
+    while run_start > 0 and buf[run_start - 1] == 0x5C:
+        run_start -= 1
+    # An odd-length run means the last backslash starts an escape
+    return (backslash - run_start) % 2 == 0
+
+def _escaped_cut(buf: bytes, cut: int) -> int:
+    """
+    Moves `cut` left so it splits neither a JSON escape sequence, a surrogate pair
+    (\\uD83D\\uDE00, emitted for emoji and other non-BMP characters) nor a UTF-8 character
+    """
+    # A pending escape is at most 6 bytes (\uXXXX)
+    backslash = buf.rfind(b"\\", max(0, cut - 6), cut)
+    if backslash >= 0 and _starts_escape(buf, backslash):
+        escape_len = 6 if buf[backslash + 1:backslash + 2] == b"u" else 2
+        if backslash + escape_len > cut:
+            cut = backslash
+    # A lone high surrogate can't be decoded: keep it with its low half
+    if cut >= 6 and _HIGH_SURROGATE_RE.fullmatch(buf, cut - 6, cut) and _starts_escape(buf, cut - 6):
+        cut -= 6
+    while 0 < cut < len(buf) and buf[cut] & 0xC0 == 0x80:
+        cut -= 1
+    return cut
+
+def _decode_escaped(body: bytes) -> str:
+    """Decodes a JSON-escaped string body; a truncated trailing escape is dropped"""
+    try:
+        return orjson.loads(b'"' + body + b'"')
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        return orjson.loads(b'"' + body[:_escaped_cut(body, len(body))] + b'"')
+    except orjson.JSONDecodeError:
+        return body.decode(errors="replace")
+
+# One follow-up question per line, minus any list numbering/bullets; only lines containing a '?'
+_FOLLOWUP_RE = re.compile(r'^[0-9.)\-•* \t]*([^\s0-9.)\-•*][^\n]*\?[^\n]*?)[ \t\r]*$', re.MULTILINE)
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_CHAIRMAN_PROMPT_TAIL = """
+        
+        FINAL RULING:
+        """
+
+def _source_label(metadata: Dict) -> str:
+    """Short citation for a chunk: case name, or Act - Section - Chapter (no other metadata reaches the prompt)"""
+    if metadata.get('source_type') == 'case_law':
+        return metadata.get('case_name') or 'Untitled Judgment'
+    section = metadata.get('section_number')
+    return " - ".join(filter(None, (metadata.get('law'), f"Section {section}" if section else None, metadata.get('chapter_title'))))
+
+def _format_context(chunks: List[Dict], max_chars: int = None) -> str:
+    """
+    Formats retrieved chunks (in rank order) as '[Source: ...]' blocks. With a budget, chunks that
+    would overflow it are dropped whole; only a lone oversized first chunk is cut.
+    """
+    parts = []
+    used = 0
+    for c in chunks:
+        block = f"[Source: {_source_label(c['metadata'])}]\n{c['text']}"
+        needed = len(block) + (2 if parts else 0)
+        if max_chars is not None and used + needed > max_chars:
+            if not parts:
+                parts.append(block[:max_chars])
+            break
+        parts.append(block)
+        used += needed
+    return "\n\n".join(parts)
+
+def _build_display_and_context(statute_chunks: List[Dict], case_chunks: List[Dict], members: bool) -> tuple[bytes, str, tuple]:
+    """
+    Returns (chunks_json, context, member_contexts) for the retrieved chunks: the CONTEXT_MAX_CHARS view
+    (fast/balanced prompts, Chairman) and, for a council, its (full, statute, case) views at the member budgets.
+    """
+    # Unified display ranks go on fresh dicts: the chunks themselves may be shared with the retrieval caches
+    display_chunks = [
+        {"rank": i, "score": c.get("score"), "text": c["text"], "metadata": c["metadata"]}
+        for i, c in enumerate(chain(statute_chunks, case_chunks), 1)
+    ]
+    
+    all_chunks = statute_chunks + case_chunks
+    context = _format_context(all_chunks, settings.CONTEXT_MAX_CHARS)
+    member_contexts = None
+    if members:
+        member_contexts = (
+            _format_context(all_chunks, settings.MEMBER_CTX_MAX_CHARS_FULL),
+            _format_context(statute_chunks, settings.MEMBER_CTX_MAX_CHARS_STATUTE),
+            _format_context(case_chunks, settings.MEMBER_CTX_MAX_CHARS_CASE),
+        )
+    return orjson.dumps(display_chunks), context, member_contexts
+
 class CouncilService:
     """
     AI Council Service v3.0
@@ -27,11 +209,84 @@ class CouncilService:
         self.MODEL_DEVIL = settings.MODEL_DEVIL
         self.MODEL_CHAIRMAN = settings.MODEL_CHAIRMAN
         
+        # Streamed system prompts composed once (with the follow-up instruction), not per request
+        self._SYS_FAST_WITH_FOLLOWUP = "You are a legal assistant. Answer the user query based on the provided context. Be concise and accurate." + settings.PROMPT_FOLLOWUP_INSTRUCTION
+        self._SYS_BALANCED_WITH_FOLLOWUP = settings.PROMPT_CHAIRMAN + "\n\nINSTRUCTION: You are acting as the sole legal authority. Analyze the User Query against the Retrieved Context (Statutes and Case Law). Considerations: 1. Constitutional validity. 2. Statutory interpretation. 3. Precedents. Formulate a balanced and legally sound answer." + settings.PROMPT_FOLLOWUP_INSTRUCTION
+        self._SYS_CHAIRMAN_WITH_FOLLOWUP = settings.PROMPT_CHAIRMAN + settings.PROMPT_FOLLOWUP_INSTRUCTION
+        
+        # Rolling window of successful member latencies (seconds), used to time the speculative Chairman
+        self._member_latencies = deque(maxlen=50)
+        
+        # Per-conversation retrieval cache: key -> (stored_at, statute_chunks, case_chunks), LRU ordered
+        self._retrieval_cache: OrderedDict[str, tuple[float, list, list]] = OrderedDict()
+        
+        # Shared HTTP client (lazy) so council calls reuse warm connections to Gemini
+        self._client = None
+        
+        # Identical concurrent Gemini requests share one call: key -> [task, waiter count]
+        self._inflight: Dict[str, list] = {}
+        
+        # Bounds concurrent Gemini calls across all requests so bursts queue here instead of hitting 429s
+        self._gemini_sem = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+        
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not found. Council service will fail.")
 
-    async def _call_gemini(self, model: str, system_prompt: str, user_query: str, enable_search: bool = False) -> str:
-        """Helper to call Gemini REST API"""
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Lazy initialization of the pooled HTTP/2 client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+
+    async def close(self):
+        """Closes the shared HTTP client (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _retry_delay(self, attempt: int, retry_after: str = None) -> float:
+        """Exponential backoff with jitter, honouring a numeric Retry-After header if present"""
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return 0.5 * 2 ** attempt + random.uniform(0, 0.5)
+
+    async def _call_gemini(self, model: str, system_prompt: str, user_query: str, enable_search: bool = False, timeout: float = None) -> str:
+        """Helper to call Gemini REST API; identical concurrent calls are coalesced into one request"""
+        timeout = timeout or settings.GEMINI_TIMEOUT_MEMBER
+        key = hashlib.sha1(f"{model}|{system_prompt}|{user_query}|{enable_search}|{timeout}".encode()).hexdigest()
+        
+        entry = self._inflight.get(key)
+        if entry is None:
+            if len(self._inflight) >= settings.GEMINI_INFLIGHT_MAX:
+                return await self._request_gemini(model, system_prompt, user_query, enable_search, timeout)
+            task = asyncio.ensure_future(self._request_gemini(model, system_prompt, user_query, enable_search, timeout))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(key, None) if self._inflight.get(key) is entry else None)
+        else:
+            logger.info(f"[Council] Joining identical in-flight Gemini request ({model})")
+        
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded so one cancelled waiter does not cancel the request for the others
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+
+    async def _request_gemini(self, model: str, system_prompt: str, user_query: str, enable_search: bool, timeout: float) -> str:
+        """Single Gemini generateContent request (bounded time, retries on timeouts and 429/503)"""
         url = f"{self.base_url}/{model}:generateContent?key={self.api_key}"
         
         # Base Prompt
@@ -44,26 +299,47 @@ class CouncilService:
         
         payload = {
             "contents": contents,
-            "generationConfig": {"temperature": settings.TEMPERATURE_COUNCIL}
+            "generationConfig": {
+                "temperature": settings.TEMPERATURE_COUNCIL,
+                "maxOutputTokens": settings.GEMINI_MAX_OUTPUT_TOKENS
+            }
         }
         
         if tools:
             payload["tools"] = tools
         
-        async with httpx.AsyncClient(timeout=40.0) as client:
-            response = await client.post(url, json=payload)
+        for attempt in range(settings.GEMINI_MAX_RETRIES + 1):
+            can_retry = attempt < settings.GEMINI_MAX_RETRIES
+            try:
+                async with self._gemini_sem:
+                    response = await asyncio.wait_for(self.client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=timeout), timeout)
+            except (asyncio.TimeoutError, httpx.TimeoutException, httpx.RemoteProtocolError) as e:
+                if not can_retry:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"Gemini request failed ({type(e).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{settings.GEMINI_MAX_RETRIES})")
+                await asyncio.sleep(delay)
+                continue
+            
+            if response.status_code in (429, 503) and can_retry:
+                delay = self._retry_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"Gemini {response.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{settings.GEMINI_MAX_RETRIES})")
+                await asyncio.sleep(delay)
+                continue
+            
             if response.status_code != 200:
                 logger.error(f"Gemini API Error ({response.status_code}): {response.text}")
                 response.raise_for_status()
-            
-            data = response.json()
-            try:
-                # Handle cases where Search tool returns 'groundingMetadata' but content is in a different structure
-                # Usually standard candidates[0].content.parts[0].text works
-                return data["candidates"][0]["content"]["parts"][0]["text"]
-            except (KeyError, IndexError):
-                logger.error(f"Gemini Malformed Response: {data}")
-                return "Error generating response."
+            break
+        
+        data = orjson.loads(response.content)
+        try:
+            # Handle cases where Search tool returns 'groundingMetadata' but content is in a different structure
+            # Usually standard candidates[0].content.parts[0].text works
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError):
+            logger.error(f"Gemini Malformed Response: {data}")
+            return "Error generating response."
 
     async def _get_member_opinion(self, role: str, model: str, system_prompt: str, user_query: str, context: str, enable_search: bool) -> Dict[str, str]:
         """Async worker to get a single council member's opinion"""
@@ -82,7 +358,9 @@ class CouncilService:
             If Web Search is enabled, verify facts if the context is insufficient.
             """
             
+            started = time.monotonic()
             opinion = await self._call_gemini(model, system_prompt, full_prompt, enable_search=enable_search)
+            self._member_latencies.append(time.monotonic() - started)
 
             return {
                 "role": role,
@@ -95,35 +373,139 @@ class CouncilService:
             logger.warning(f"[{role}] Absented due to error: {str(e)}")
             return None
 
-    async def _get_chairman_ruling(self, query: str, context: str, opinions: List[Dict[str, str]], enable_search: bool) -> str:
-        """The Chairman synthesizes all opinions into a final answer"""
+    def _get_cached_retrieval(self, key: str):
+        """Returns (statute_chunks, case_chunks) if a fresh entry exists, else None"""
+        entry = self._retrieval_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, statute_chunks, case_chunks = entry
+        if time.monotonic() - stored_at > settings.RETRIEVAL_CACHE_TTL_SECONDS:
+            del self._retrieval_cache[key]
+            return None
+        self._retrieval_cache.move_to_end(key)
+        return statute_chunks, case_chunks
+
+    def _cache_retrieval(self, key: str, statute_chunks: list, case_chunks: list):
+        self._retrieval_cache[key] = (time.monotonic(), statute_chunks, case_chunks)
+        self._retrieval_cache.move_to_end(key)
+        while len(self._retrieval_cache) > settings.RETRIEVAL_CACHE_MAX_ENTRIES:
+            self._retrieval_cache.popitem(last=False)
+
+    def _member_latency_p50(self) -> float:
+        """Median latency of recent council members, or the configured default if none recorded yet"""
+        if not self._member_latencies:
+            return settings.COUNCIL_SPECULATION_DEFAULT_DELAY
+        return statistics.median(self._member_latencies)
+
+    def _condense_opinion(self, opinion: Dict[str, str], selected: list, budget: int) -> Dict[str, str]:
+        """
+        Keeps only the novel sentences of an opinion for the Chairman.
+        Sentences too similar to ones already in `selected` (restated context, shared conclusions)
+        are dropped and the rest is capped at `budget` chars. `selected` is extended in place,
+        so opinions can be condensed one at a time as they arrive.
+        """
+        kept = []
+        used = 0
+        for sentence in _SENTENCE_SPLIT_RE.split(opinion['opinion']):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if used + len(sentence) > budget:
+                break
+            vector = _bag_of_words(sentence)
+            if any(_cosine(vector, other) >= settings.COUNCIL_NOVELTY_THRESHOLD for other in selected):
+                continue
+            selected.append(vector)
+            kept.append(sentence)
+            used += len(sentence) + 1
+        return {**opinion, 'opinion': "\n".join(kept)}
+
+    def _condense_opinions(self, opinions: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Condenses a full set of opinions, each getting an equal share of COUNCIL_OPINIONS_MAX_CHARS"""
         valid_opinions = [op for op in opinions if op is not None]
-        
-        opinions_text = "\n\n".join([
-            f"=== OPINION FROM {op['role']} ===\n{op['opinion']}"
-            for op in valid_opinions
-        ])
+        if not valid_opinions:
+            return []
+
+        budget = settings.COUNCIL_OPINIONS_MAX_CHARS // len(valid_opinions)
+        selected = []
+        return [self._condense_opinion(op, selected, budget) for op in valid_opinions]
 
-        system_prompt = settings.PROMPT_CHAIRMAN
+    def _format_opinion(self, opinion: Dict[str, str]) -> str:
+        return f"=== OPINION FROM {opinion['role']} ===\n{opinion['opinion']}"
 
-        user_prompt = f"""
+    def _chairman_prompt_head(self, query: str, context: str) -> str:
+        """
+        The part of the Chairman's user prompt that precedes the council opinions.
+        `context` is expected to be truncated to CONTEXT_MAX_CHARS already.
+        """
+        return f"""
         QUERY: {query}
         
         RETRIEVED CONTEXT:
-        {context[:settings.CONTEXT_MAX_CHARS]} 
+        {context} 
         
         COUNCIL OPINIONS:
-        {opinions_text}
-        
-        FINAL RULING:
         """
+
+    def _build_chairman_prompt(self, query: str, context: str, opinions_text: str) -> tuple:
+        """Builds the (system_prompt, user_prompt) pair for the Chairman"""
+        return settings.PROMPT_CHAIRMAN, self._chairman_prompt_head(query, context) + opinions_text + _CHAIRMAN_PROMPT_TAIL
+
+    async def _get_chairman_ruling(self, query: str, context: str, opinions: List[Dict[str, str]], enable_search: bool) -> str:
+        """The Chairman synthesizes all opinions into a final answer"""
+        opinions_text = "\n\n".join(self._format_opinion(op) for op in self._condense_opinions(opinions))
+        system_prompt, user_prompt = self._build_chairman_prompt(query, context[:settings.CONTEXT_MAX_CHARS], opinions_text)
         
         try:
-            return await self._call_gemini(self.MODEL_CHAIRMAN, system_prompt, user_prompt, enable_search=enable_search)
+            return await self._call_gemini(self.MODEL_CHAIRMAN, system_prompt, user_prompt, enable_search=enable_search, timeout=settings.GEMINI_TIMEOUT_CHAIRMAN)
         except Exception as e:
             logger.error(f"[Chairman] Failed: {e}")
             return "The Chairman could not issue a ruling due to technical difficulties."
 
+    def _start_chairman_stream(self, prompt_head: str, opinions_text: str, enable_search: bool) -> tuple:
+        """
+        Starts the Chairman stream in the background, buffering its events in a queue.
+        Returns (task, queue, started) where `started` resolves once the first event is buffered.
+        """
+        system_prompt = self._SYS_CHAIRMAN_WITH_FOLLOWUP
+        user_prompt = prompt_head + opinions_text + _CHAIRMAN_PROMPT_TAIL
+        queue = asyncio.Queue()
+        started = asyncio.get_running_loop().create_future()
+
+        async def pump():
+            try:
+                async for event in self._generate_and_stream_response(self.MODEL_CHAIRMAN, system_prompt, user_prompt, enable_search):
+                    queue.put_nowait(event)
+                    if not started.done():
+                        started.set_result(True)
+            finally:
+                queue.put_nowait(None)  # End-of-stream marker
+                if not started.done():
+                    started.set_result(True)
+
+        return asyncio.create_task(pump()), queue, started
+
+    def _cancel_chairman_stream(self, chairman: tuple):
+        task, _, started = chairman
+        task.cancel()
+        if not started.done():
+            started.cancel()
+
+    async def _drain_chairman_stream(self, chairman: tuple):
+        """Yields the buffered and remaining Chairman events, re-raising any failure"""
+        task, queue, _ = chairman
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if not task.done():
+                task.cancel()
+        if not task.cancelled() and task.exception():
+            raise task.exception()
+
     async def deliberate_stream(self, query: str, chat_history: List[Dict] = [], enable_web_search: bool = False, conv_id:str = None, context_window_size: int = 5, mode: str = "research"):
         """
         Main Streaming Pipeline v3.0
@@ -134,7 +516,6 @@ class CouncilService:
         """
         
         # --- STEP 1: THE CLERK ---
-        loop = asyncio.get_running_loop()
         
         logger.info(f"[Council] ========== PIPELINE START ==========")
         logger.info(f"[Council] Query: {query}")
@@ -143,33 +524,49 @@ class CouncilService:
         logger.info(f"[Council] History Messages Retrieved: {len(chat_history)}")
         logger.info(f"[Council] Web Search: {enable_web_search}")
         
-        yield f"log: [STEP 1/4] Clerk analyzing query intent...\n"
-        yield f"log: Context window: {context_window_size} (retrieved {len(chat_history)} messages)\n"
+        context_window_log = f"log: Context window: {context_window_size} (retrieved {len(chat_history)} messages)\n"
+        yield _LOG_STEP1
+        yield context_window_log
         
-        clerk_resp = await clerk_service.classify_and_route(query, chat_history, enable_web_search=enable_web_search, mode=mode)
+        # Speculatively search with the raw query while the Clerk runs; reused only if the Clerk keeps the query
+        speculative_search = None
+        if settings.SPECULATIVE_RETRIEVAL:
+            speculative_search = asyncio.ensure_future(qdrant_service.asearch_statutes_and_cases(query))
+        
+        try:
+            clerk_resp = await clerk_service.classify_and_route(query, chat_history, enable_web_search=enable_web_search, mode=mode)
+        except BaseException:
+            # Clerk failure or client disconnect: don't leave the speculative search running unowned
+            if speculative_search is not None:
+                speculative_search.cancel()
+            raise
         
         if not clerk_resp.is_legal:
             # NON-LEGAL BYPASS
+            if speculative_search is not None:
+                speculative_search.cancel()
+                speculative_search = None
             # Backend: Detailed logging
-            logger.info(f"[Council] NON-LEGAL Query Detected")
-            logger.info(f"[Council] Query: {query}")
-            logger.info(f"[Council] Context Window: {len(chat_history)} messages")
-            logger.info(f"[Council] Web Search Enabled: {enable_web_search}")
-            if chat_history:
-                logger.info(f"[Council] Recent History Glimpse:")
-                for msg in chat_history[-3:]:  # Last 3 messages
-                    role = msg.get('role', 'unknown')
-                    content = msg.get('content', '')[:100]  # First 100 chars
-                    logger.info(f"  - {role.upper()}: {content}...")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[Council] NON-LEGAL Query Detected")
+                logger.info("[Council] Query: %s", query)
+                logger.info("[Council] Context Window: %d messages", len(chat_history))
+                logger.info("[Council] Web Search Enabled: %s", enable_web_search)
+                recent = chat_history[-3:]  # Last 3 messages
+                if recent:
+                    logger.info("[Council] Recent History Glimpse:")
+                    for msg in recent:
+                        # First 100 chars
+                        logger.info("  - %s: %s...", msg.get('role', 'unknown').upper(), msg.get('content', '')[:100])
             
             # Frontend: Concise stream logs
-            yield f"log: ✓ Clerk classified as NON-LEGAL query\n"
-            yield f"log: Context window: {context_window_size} (retrieved {len(chat_history)} messages)\n"
+            yield _LOG_NON_LEGAL
+            yield context_window_log
             
             if enable_web_search:
-                yield f"log: Web Search: ENABLED (using Gemini's grounding)\n"
+                yield _LOG_DIRECT_WEB
             
-            yield f"log: Generating direct response (bypassing legal council)...\n"
+            yield _LOG_DIRECT_ANSWER
             answer = clerk_resp.direct_answer or "I cannot answer this legal query."
             
             
@@ -178,8 +575,7 @@ class CouncilService:
             logger.info(f"[Council] Direct Answer Preview: {answer[:200]}...")
             
             # Send Final Answer Event
-            import json
-            yield f"data: {json.dumps({'answer': answer})}\n"
+            yield f"data: {orjson.dumps({'answer': answer}).decode()}\n"
             return
 
         # LEGAL QUERY HANDLING
@@ -199,79 +595,107 @@ class CouncilService:
         #      pass
 
         # Backend: Detailed legal path logging
-        logger.info(f"[Council] ========== LEGAL PATH INITIATED ==========")
-        logger.info(f"[Council] Mode: {mode}")
-        logger.info(f"[Council] Original Query: {query}")
-        logger.info(f"[Council] Rewritten Query: {rewritten_query}")
-        logger.info(f"[Council] Search Intents: {[i.value for i in intents]}")
-        logger.info(f"[Council] Context Window: {len(chat_history)} messages")
-        logger.info(f"[Council] Web Search: {enable_web_search}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Council] ========== LEGAL PATH INITIATED ==========")
+            logger.info("[Council] Mode: %s", mode)
+            logger.info("[Council] Original Query: %s", query)
+            logger.info("[Council] Rewritten Query: %s", rewritten_query)
+            logger.info("[Council] Search Intents: %s", [i.value for i in intents])
+            logger.info("[Council] Context Window: %d messages", len(chat_history))
+            logger.info("[Council] Web Search: %s", enable_web_search)
         
         # Frontend: User-friendly logging
-        yield f"log: ✓ Clerk classified as LEGAL query\n"
+        yield _LOG_LEGAL
         yield f"log: Intent: {', '.join([i.value.replace('search_', '').title() for i in intents])}\n"
         
         if enable_web_search:
-            yield f"log: Web Search: ENABLED (Gemini grounding active)\n"
+            yield _LOG_WEB_ON
         else:
-            yield f"log: Web Search: DISABLED (using local database only)\n"
+            yield _LOG_WEB_OFF
         
         if rewritten_query != query:
-            yield f"log: Query optimized for better search results\n"
+            yield _LOG_QUERY_OPTIMIZED
             logger.info(f"[Council] Query Optimization Applied")
+        
+        if speculative_search is not None and " ".join(rewritten_query.lower().split()) != " ".join(query.lower().split()):
+            logger.info(f"[Council] Discarding speculative search (query was rewritten)")
+            speculative_search.cancel()
+            speculative_search = None
 
         # --- STEP 2: PARALLEL RETRIEVAL ---
         logger.info(f"[Council] ========== STEP 2: DATABASE RETRIEVAL ==========")
-        yield f"log: \n"
-        yield f"log: [STEP 2/4] Searching Legal Databases...\n"
-        
-        # Define tasks
-        search_tasks = []
-        search_types = []
-        
-        if IntentType.SEARCH_STATUTES in intents or IntentType.SEARCH_BOTH in intents:
-            logger.info(f"[Council] Scheduling Statutes Search (Qdrant Collection: indian_legal_docs)")
-            logger.info(f"[Council] Search Query: {rewritten_query}")
-            logger.info(f"[Council] Top-K: {settings.RAG_TOP_K}")
-            search_tasks.append(loop.run_in_executor(None, qdrant_service.search_statutes, rewritten_query))
-            search_types.append("Statutes")
-            yield f"log: → Querying Statutes database (Indian Penal Code, CrPC, etc.)\n"
-        else:
-            search_tasks.append(asyncio.sleep(0)) # Dummy
-
-        if IntentType.SEARCH_CASES in intents or IntentType.SEARCH_BOTH in intents:
-            logger.info(f"[Council] Scheduling Cases Search (Qdrant Collection: supreme_court_cases)")
-            logger.info(f"[Council] Search Query: {rewritten_query}")
-            logger.info(f"[Council] Top-K: {settings.RAG_TOP_K}")
-            search_tasks.append(loop.run_in_executor(None, qdrant_service.search_cases, rewritten_query))
-            search_types.append("Cases")
-            yield f"log: → Querying Case Law database (Supreme Court precedents)\n"
-        else:
-            search_tasks.append(asyncio.sleep(0)) # Dummy
-
-        # Execute Search
-        logger.info(f"[Council] Executing {len([t for t in search_types])} parallel search tasks...")
-        yield f"log: Executing parallel vector similarity search...\n"
-        
-        raw_results = await asyncio.gather(*search_tasks)
+        yield _LOG_BLANK
+        yield _LOG_STEP2
         
-        statute_chunks = raw_results[0] if isinstance(raw_results[0], list) else []
-        case_chunks = raw_results[1] if isinstance(raw_results[1], list) else []
+        # Normalize intents once so SEARCH_BOTH and the specific intents never schedule a collection twice
+        intent_set = set(intents)
+        want_statutes = bool(intent_set & {IntentType.SEARCH_STATUTES, IntentType.SEARCH_BOTH})
+        want_cases = bool(intent_set & {IntentType.SEARCH_CASES, IntentType.SEARCH_BOTH})
         
-        # Backend: Detailed retrieval results
-        logger.info(f"[Council] Retrieval Results:")
-        logger.info(f"  - Statutes: {len(statute_chunks)} documents")
-        if statute_chunks:
-            for i, chunk in enumerate(statute_chunks[:3]):
-                logger.info(f"    [{i+1}] {chunk['metadata'].get('law', 'Unknown')} (Score: {chunk.get('score', 0):.3f})")
+        # Follow-ups in the same conversation often re-ask the same thing: reuse recent results
+        cache_key = None
+        cached = None
+        if conv_id:
+            cache_key = f"{conv_id}:{int(want_statutes)}{int(want_cases)}:{hashlib.sha1(rewritten_query.encode()).hexdigest()}"
+            cached = self._get_cached_retrieval(cache_key)
         
-        logger.info(f"  - Cases: {len(case_chunks)} documents")
-        if case_chunks:
-            for i, chunk in enumerate(case_chunks[:3]):
-                logger.info(f"    [{i+1}] {chunk['metadata'].get('case_name', 'Unknown')} (Score: {chunk.get('score', 0):.3f})")
+        if cached:
+            statute_chunks, case_chunks = cached
+            if speculative_search is not None:
+                speculative_search.cancel()
+            logger.info(f"[Council] Retrieval cache HIT for conversation {conv_id}")
+            yield _LOG_CACHE_REUSE
+        else:
+            search_types = []
+            
+            if want_statutes:
+                logger.info(f"[Council] Scheduling Statutes Search (Qdrant Collection: indian_legal_docs)")
+                logger.info(f"[Council] Search Query: {rewritten_query}")
+                logger.info(f"[Council] Top-K: {settings.RAG_TOP_K}")
+                search_types.append("Statutes")
+                yield _LOG_QUERY_STATUTES
+
+            if want_cases:
+                logger.info(f"[Council] Scheduling Cases Search (Qdrant Collection: supreme_court_cases)")
+                logger.info(f"[Council] Search Query: {rewritten_query}")
+                logger.info(f"[Council] Top-K: {settings.RAG_TOP_K}")
+                search_types.append("Cases")
+                yield _LOG_QUERY_CASES
+
+            # Execute Search
+            logger.info(f"[Council] Executing {len(search_types)} parallel search tasks...")
+            yield _LOG_VECTOR_SEARCH
+            
+            if speculative_search is not None:
+                statute_chunks, case_chunks = await speculative_search
+                # Speculative results cover both collections; keep only what the Clerk asked for
+                statute_chunks = statute_chunks if want_statutes else []
+                case_chunks = case_chunks if want_cases else []
+            elif want_statutes and want_cases:
+                # One embedding call shared by both collection queries
+                statute_chunks, case_chunks = await qdrant_service.asearch_statutes_and_cases(rewritten_query)
+            else:
+                # At most one collection: no placeholder slot, and nothing is searched when no intent asks for it
+                statute_chunks = await qdrant_service.asearch_statutes(rewritten_query) if want_statutes else []
+                case_chunks = await qdrant_service.asearch_cases(rewritten_query) if want_cases else []
+            
+            if cache_key:
+                self._cache_retrieval(cache_key, statute_chunks, case_chunks)
         
         total_docs = len(statute_chunks) + len(case_chunks)
-        logger.info(f"[Council] Total Retrieved: {total_docs} documents")
+        
+        # Backend: Detailed retrieval results
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[Council] Retrieval Results:")
+            logger.info("  - Statutes: %d documents", len(statute_chunks))
+            for i, chunk in enumerate(statute_chunks[:3], 1):
+                logger.info("    [%d] %s (Score: %.3f)", i, chunk['metadata'].get('law', 'Unknown'), chunk.get('score', 0))
+            
+            logger.info("  - Cases: %d documents", len(case_chunks))
+            for i, chunk in enumerate(case_chunks[:3], 1):
+                logger.info("    [%d] %s (Score: %.3f)", i, chunk['metadata'].get('case_name', 'Unknown'), chunk.get('score', 0))
+            
+            logger.info("[Council] Total Retrieved: %d documents", total_docs)
         
         # Frontend: Concise results
         yield f"log: ✓ Found {len(statute_chunks)} Statutes, {len(case_chunks)} Case Precedents\n"
@@ -279,37 +703,27 @@ class CouncilService:
             avg_score = sum([c.get('score', 0) for c in statute_chunks + case_chunks]) / total_docs
             yield f"log: Average relevance score: {avg_score:.1%}\n"
         
+        # Display payload and the budgeted context strings are pure CPU work; keep them off the event loop
+        chunks_json, context, member_contexts = await asyncio.to_thread(
+            _build_display_and_context, statute_chunks, case_chunks, mode not in (ChatMode.FAST, ChatMode.BALANCED)
+        )
+        
         # Send Chunks to UI (Merged list)
-        all_chunks = statute_chunks + case_chunks
-        # Re-rank based on scores broadly? Or just concat. Concat is fine for display.
-        # Assign unified ranks for display
-        for i, c in enumerate(all_chunks):
-            c['rank'] = i + 1
-            
-        import json
-        yield f"chunks: {json.dumps(all_chunks)}\n"
-
-        # Context Formatting
-        def format_context(chunks):
-            return "\n\n".join([f"[Source: {c['metadata'].get('title')}]\n{c['text']}" for c in chunks])
-            
-        statute_ctx = format_context(statute_chunks)
-        case_ctx = format_context(case_chunks)
-        full_ctx = statute_ctx + "\n\n" + case_ctx
+        yield f"chunks: {chunks_json.decode()}\n"
 
         # --- STEP 3: COUNCIL DELIBERATION (OR FAST BYPASS) ---
         logger.info(f"[Council] ========== STEP 3: COUNCIL DELIBERATION ==========")
-        yield f"log: \n"
+        yield _LOG_BLANK
         
         # === FAST MODE: SINGLE SHOT DIRECT ===
         if mode == ChatMode.FAST:
-            yield f"log: [STEP 3/3] Generating Fast Answer (Direct Mode)...\n"
+            yield _LOG_STEP3_FAST
             
             # Simple Prompt
-            system_prompt = "You are a legal assistant. Answer the user query based on the provided context. Be concise and accurate."
-            user_prompt = f"QUERY: {rewritten_query}\n\nCONTEXT:\n{full_ctx}" # Use full_ctx (Statutes + Cases)
+            system_prompt = self._SYS_FAST_WITH_FOLLOWUP
+            user_prompt = f"QUERY: {rewritten_query}\n\nCONTEXT:\n{context}" # Statutes + Cases, within budget
             
-            yield f"log: Generating direct response from retrieved documents...\n"
+            yield _LOG_FAST_ANSWER
             
             # Use unified helper
             async for event in self._generate_and_stream_response(settings.MODEL_CLERK, system_prompt, user_prompt, enable_web_search):
@@ -318,40 +732,43 @@ class CouncilService:
 
         # === BALANCED MODE: REASONING ONE-SHOT ===
         if mode == ChatMode.BALANCED:
-            yield f"log: [STEP 3/3] Generating Balanced Analysis (Reasoning Mode)...\n"
+            yield _LOG_STEP3_BALANCED
             
             # Chain of Thought Prompt
-            system_prompt = settings.PROMPT_CHAIRMAN + "\n\nINSTRUCTION: You are acting as the sole legal authority. Analyze the User Query against the Retrieved Context (Statutes and Case Law). Considerations: 1. Constitutional validity. 2. Statutory interpretation. 3. Precedents. Formulate a balanced and legally sound answer."
-            user_prompt = f"QUERY: {rewritten_query}\n\nRETRIEVED CONTEXT:\n{full_ctx}"
+            system_prompt = self._SYS_BALANCED_WITH_FOLLOWUP
+            user_prompt = f"QUERY: {rewritten_query}\n\nRETRIEVED CONTEXT:\n{context}"
             
-            yield f"log: Analyzing context with Chairman model (One-Shot)...\n"
+            yield _LOG_BALANCED_ANSWER
             
             # Use unified helper
             async for event in self._generate_and_stream_response(self.MODEL_CHAIRMAN, system_prompt, user_prompt, enable_web_search):
                 yield event
             return
 
-        yield f"log: [STEP 3/4] Convening AI Legal Council (Deep Mode)...\n"
+        yield _LOG_STEP3_DEEP
         
         # Define Member Tasks with Specialized Context
         tasks = []
         council_members = []
         
+        # Role-specific budgets, cut at chunk boundaries; the broad view is built once and shared
+        member_full_ctx, member_statute_ctx, member_case_ctx = member_contexts
+        
         # Backend: Log context preparation
         logger.info(f"[Council] Preparing context for council members:")
-        logger.info(f"  - Full Context Length: {len(full_ctx)} chars")
-        logger.info(f"  - Statute Context Length: {len(statute_ctx)} chars")
-        logger.info(f"  - Case Context Length: {len(case_ctx)} chars")
+        logger.info(f"  - Full Context Length: {len(member_full_ctx)} chars")
+        logger.info(f"  - Statute Context Length: {len(member_statute_ctx)} chars")
+        logger.info(f"  - Case Context Length: {len(member_case_ctx)} chars")
         
         # 1. Constitutional Expert (Needs Broad Context)
         logger.info(f"[Council] Assigning Constitutional Expert (Model: {self.MODEL_CONSTITUTIONAL})")
         tasks.append(self._get_member_opinion(
             "Constitutional Expert", self.MODEL_CONSTITUTIONAL,
             settings.PROMPT_CONSTITUTIONAL,
-            rewritten_query, full_ctx, enable_web_search
+            rewritten_query, member_full_ctx, enable_web_search
         ))
         council_members.append("Constitutional Expert")
-        yield f"log: → Constitutional Expert analyzing fundamental rights & validity\n"
+        yield _LOG_MEMBER_CONSTITUTIONAL
         
         # 2. Statutory Analyst
         if statute_chunks:
@@ -360,10 +777,10 @@ class CouncilService:
             tasks.append(self._get_member_opinion(
                 "Statutory Analyst", self.MODEL_STATUTORY,
                 settings.PROMPT_STATUTORY,
-                rewritten_query, statute_ctx, enable_web_search
+                rewritten_query, member_statute_ctx, enable_web_search
             ))
             council_members.append("Statutory Analyst")
-            yield f"log: → Statutory Analyst examining legal provisions & penalties\n"
+            yield _LOG_MEMBER_STATUTORY
         else:
             logger.info(f"[Council] Skipping Statutory Analyst (no statute chunks)")
             
@@ -375,99 +792,181 @@ class CouncilService:
             tasks.append(self._get_member_opinion(
                 "Case Law Researcher", self.MODEL_CASE_LAW,
                 settings.PROMPT_CASE_LAW,
-                rewritten_query, case_ctx, enable_web_search
+                rewritten_query, member_case_ctx, enable_web_search
             ))
             council_members.append("Case Law Researcher")
-            yield f"log: → Case Law Researcher reviewing precedents & judgments\n"
+            yield _LOG_MEMBER_CASE_LAW
         else:
             logger.info(f"[Council] Skipping Case Law Researcher (no cases/search disabled)")
              
         # 4. Devil's Advocate
+        # With at least two other members, it is held back until their first two opinions are in:
+        # if those already agree closely it would mostly restate boilerplate objections, so it is skipped.
         logger.info(f"[Council] Assigning Devil's Advocate (Model: {self.MODEL_DEVIL})")
-        tasks.append(self._get_member_opinion(
+        launch_devil = lambda: asyncio.create_task(self._get_member_opinion(
             "Devil's Advocate", self.MODEL_DEVIL,
             settings.PROMPT_DEVIL,
-            rewritten_query, full_ctx, enable_web_search
+            rewritten_query, member_full_ctx, enable_web_search
         ))
+        devil_deferred = len(tasks) >= 2
         council_members.append("Devil's Advocate")
-        yield f"log: → Devil's Advocate identifying counterarguments & loopholes\n"
+        if not devil_deferred:
+            yield _LOG_MEMBER_DEVIL
         
         logger.info(f"[Council] Total Council Members: {len(council_members)}")
         logger.info(f"[Council] Members: {', '.join(council_members)}")
-        yield f"log: Council size: {len(council_members)} expert members\n"
-        yield f"log: Awaiting parallel deliberations...\n"
+        if devil_deferred:
+            yield f"log: Council size: {len(council_members) - 1} expert members (+ Devil's Advocate if opinions diverge)\n"
+        else:
+            yield f"log: Council size: {len(council_members)} expert members\n"
+        yield _LOG_AWAITING
         
         # Execute Council
+        # Members run as tasks so the Chairman can start speculatively once a quorum of
+        # opinions is in, overlapping its prefill with the slowest member's latency.
+        member_tasks = [asyncio.create_task(t) for t in tasks]
+        if not devil_deferred:
+            member_tasks.append(launch_devil())
+        pending = set(member_tasks)
+        quorum = max(2, math.ceil(len(council_members) / 2))
+        speculation_delay = self._member_latency_p50()
+        council_start = time.monotonic()
         completed_opinions = []
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            if result:
-                completed_opinions.append(result)
-                opinion_length = len(result.get('opinion', ''))
-                logger.info(f"[Council] {result['role']} completed (Opinion: {opinion_length} chars)")
-                yield f"opinion: {json.dumps(result)}\n"
-                yield f"log: ✓ {result['role']} submitted opinion ({opinion_length} chars)\n"
-
-        # --- STEP 4: CHAIRMAN RULING ---
-        logger.info(f"[Council] ========== STEP 4: CHAIRMAN SYNTHESIS ==========")
-        
-        if not completed_opinions:
-            logger.error(f"[Council] CRITICAL: No opinions received from council")
-            yield f"log: ✗ Error: Council failed to deliberate\n"
-            yield f"data: {json.dumps({'error': 'Council failed to deliberate.'})}\n"
-            return
-
-        logger.info(f"[Council] Received {len(completed_opinions)} opinions")
-        logger.info(f"[Council] Opinion Summary:")
-        for op in completed_opinions:
-            logger.info(f"  - {op['role']}: {len(op.get('opinion', ''))} chars")
+        chairman = None  # Speculative Chairman stream (task, queue, started)
+        devil_task = None  # Set when the Devil's Advocate is launched late; the Chairman then waits for it
         
-        yield f"log: \n"
-        yield f"log: [STEP 4/4] Chairman synthesizing final ruling...\n"
-        yield f"log: Analyzing {len(completed_opinions)} expert opinions\n"
-        
-        
-        # Calculate total context being sent to Chairman
-        total_context_chars = len(full_ctx) + sum(len(op.get('opinion', '')) for op in completed_opinions)
-        logger.info(f"[Council] Total Context for Chairman: {total_context_chars} chars")
-        logger.info(f"  - Retrieved Documents: {len(full_ctx)} chars")
-        logger.info(f"  - Council Opinions: {sum(len(op.get('opinion', '')) for op in completed_opinions)} chars")
-        logger.info(f"[Council] Calling Chairman (Model: {self.MODEL_CHAIRMAN})")
+        # Chairman inputs are built incrementally as opinions arrive, so (re)starting it costs one join
+        chairman_head = self._chairman_prompt_head(rewritten_query, context)
+        opinion_budget = settings.COUNCIL_OPINIONS_MAX_CHARS // len(council_members)
+        novelty_selected = []
+        opinion_blocks = []
+        opinion_chars = 0
+        kept_chars = 0
+
+        # Member tasks and the Chairman pump have no other owner: if the client goes away at any
+        # yield below, the finally cancels them instead of letting them run on unread
+        try:
+            while pending or devil_deferred:
+                if devil_deferred and (len(completed_opinions) >= 2 or not pending):
+                    devil_deferred = False
+                    agreement = 0.0
+                    if len(completed_opinions) >= 2:
+                        agreement = _cosine(_bag_of_words(completed_opinions[0]['opinion']), _bag_of_words(completed_opinions[1]['opinion']))
+                    if agreement >= settings.COUNCIL_DEVIL_SKIP_SIMILARITY:
+                        logger.info(f"[Council] First opinions agree (similarity {agreement:.2f}). Skipping Devil's Advocate")
+                        # Size the quorum and the remaining opinion budgets for the members that actually run
+                        council_members.remove("Devil's Advocate")
+                        quorum = max(2, math.ceil(len(council_members) / 2))
+                        opinion_budget = settings.COUNCIL_OPINIONS_MAX_CHARS // len(council_members)
+                        yield _LOG_DEVIL_SKIPPED
+                    else:
+                        logger.info(f"[Council] Launching Devil's Advocate (similarity {agreement:.2f})")
+                        devil_task = launch_devil()
+                        member_tasks.append(devil_task)
+                        pending.add(devil_task)
+                        yield _LOG_MEMBER_DEVIL
+                    continue
+
+                timeout = None
+                if chairman is None and settings.COUNCIL_SPECULATIVE_CHAIRMAN and len(completed_opinions) >= quorum and devil_task not in pending:
+                    wait_left = speculation_delay - (time.monotonic() - council_start)
+                    if wait_left <= 0:
+                        logger.info(f"[Council] Quorum reached ({len(completed_opinions)}/{len(council_members)}). Starting Chairman speculatively")
+                        chairman = self._start_chairman_stream(chairman_head, "\n\n".join(opinion_blocks), enable_web_search)
+                    else:
+                        timeout = wait_left
+
+                waiters = set(pending)
+                if chairman:
+                    waiters.add(chairman[2])
+                done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if chairman and chairman[2] in done:
+                    # Chairman is already streaming; late opinions can no longer be used
+                    break
+
+                for task in done:
+                    pending.discard(task)
+                    result = task.result()
+                    if result:
+                        completed_opinions.append(result)
+                        opinion_length = len(result.get('opinion', ''))
+                        logger.info(f"[Council] {result['role']} completed (Opinion: {opinion_length} chars)")
+                        yield f"opinion: {orjson.dumps(result).decode()}\n"
+                        yield f"log: ✓ {result['role']} submitted opinion ({opinion_length} chars)\n"
+                    
+                        condensed = self._condense_opinion(result, novelty_selected, opinion_budget)
+                        opinion_blocks.append(self._format_opinion(condensed))
+                        opinion_chars += opinion_length
+                        kept_chars += len(condensed['opinion'])
+
+                        if chairman:
+                            # Late opinion arrived before the Chairman spoke: re-issue with the fuller set
+                            logger.info(f"[Council] {result['role']} arrived before Chairman started streaming. Re-issuing")
+                            self._cancel_chairman_stream(chairman)
+                            chairman = None
+
+            if pending:
+                logger.info(f"[Council] Chairman already streaming. Dismissing {len(pending)} late member(s)")
+                yield f"log: Proceeding without {len(pending)} late member(s)\n"
+                for task in pending:
+                    task.cancel()
+
+            # --- STEP 4: CHAIRMAN RULING ---
+            logger.info(f"[Council] ========== STEP 4: CHAIRMAN SYNTHESIS ==========")
         
-        yield f"log: Context size: {total_context_chars:,} characters\n"
-        yield f"log: Generating comprehensive legal analysis (Final Ruling)...\n"
+            if not completed_opinions:
+                logger.error(f"[Council] CRITICAL: No opinions received from council")
+                yield _LOG_COUNCIL_FAILED
+                yield f"data: {orjson.dumps({'error': 'Council failed to deliberate.'}).decode()}\n"
+                return
+
+            logger.info(f"[Council] Received {len(completed_opinions)} opinions")
+            logger.info(f"[Council] Opinion Summary:")
+            for op in completed_opinions:
+                logger.info(f"  - {op['role']}: {len(op.get('opinion', ''))} chars")
         
-        # Prepare Prompt for Chairman (reconstruct prompt logic from _get_chairman_ruling)
-        valid_opinions = [op for op in completed_opinions]
-        opinions_text = "\n\n".join([
-            f"=== OPINION FROM {op['role']} ===\n{op['opinion']}"
-            for op in valid_opinions
-        ])
+            yield _LOG_BLANK
+            yield _LOG_STEP4
+            yield f"log: Analyzing {len(completed_opinions)} expert opinions\n"
         
-        system_prompt = settings.PROMPT_CHAIRMAN
-        user_prompt = f"""
-        QUERY: {rewritten_query}
         
-        RETRIEVED CONTEXT:
-        {full_ctx[:settings.CONTEXT_MAX_CHARS]} 
+            # Calculate total context being sent to Chairman
+            total_context_chars = len(context) + opinion_chars
+            logger.info(f"[Council] Total Context for Chairman: {total_context_chars} chars")
+            logger.info(f"  - Retrieved Documents: {len(context)} chars")
+            logger.info(f"  - Council Opinions: {opinion_chars} chars")
+            logger.info(f"[Council] Calling Chairman (Model: {self.MODEL_CHAIRMAN})")
         
-        COUNCIL OPINIONS:
-        {opinions_text}
+            logger.info(f"[Council] Condensed opinions: kept {kept_chars}/{opinion_chars} chars")
         
-        FINAL RULING:
-        """
+            yield f"log: Context size: {total_context_chars:,} characters\n"
+            yield f"log: Opinions condensed to novel points: ~{kept_chars // 4:,}/{opinion_chars // 4:,} tokens kept\n"
+            yield _LOG_FINAL_RULING
         
-        # Use unified helper
-        async for event in self._generate_and_stream_response(self.MODEL_CHAIRMAN, system_prompt, user_prompt, enable_web_search):
+            # Reuse the speculative Chairman if it is still valid, otherwise start it now
+            if chairman is None:
+                chairman = self._start_chairman_stream(chairman_head, "\n\n".join(opinion_blocks), enable_web_search)
+            ruling, chairman = chairman, None  # From here the drain owns (and cancels) it
+        finally:
+            for task in pending:
+                task.cancel()
+            if chairman is not None:
+                self._cancel_chairman_stream(chairman)
+
+        async for event in self._drain_chairman_stream(ruling):
             yield event
 
         logger.info(f"[Council] ========== PIPELINE COMPLETE ==========")
         
-        yield f"log: ✓ Complete.\n"
+        yield _LOG_COMPLETE
 
 
-    async def _stream_call_gemini(self, model: str, system_prompt: str, user_query: str, enable_search: bool = False):
-        """Helper to call Gemini REST API with Streaming"""
+    async def _stream_call_gemini(self, model: str, system_prompt: str, user_query: str, enable_search: bool = False, raw: bool = False):
+        """
+        Helper to call Gemini REST API with Streaming.
+        Yields text chunks, or with raw=True their JSON-escaped bytes (ready to frame without re-encoding).
+        """
         url = f"{self.base_url}/{model}:streamGenerateContent?key={self.api_key}&alt=sse"
         
         # Base Prompt
@@ -486,38 +985,47 @@ class CouncilService:
         if tools:
             payload["tools"] = tools
             
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream("POST", url, json=payload) as response:
-                if response.status_code != 200:
-                    error_body = await response.aread()
-                    logger.error(f"Gemini Streaming Error ({response.status_code}): {error_body.decode()}")
-                    yield f"[Error: {response.status_code}]"
-                    return
-
-                try:
-                    # Parse SSE-like JSON stream
-                    async for line in response.aiter_lines():
-                        if not line: continue
-                        
-                        if line.startswith("data:"):
-                            try:
-                                json_str = line[5:].strip()
-                                if not json_str: continue
-                                
-                                data = json.loads(json_str)
-                                if "candidates" in data:
-                                    candidate = data["candidates"][0]
-                                    if "content" in candidate and "parts" in candidate["content"]:
-                                        text_chunk = candidate["content"]["parts"][0].get("text", "")
-                                        if text_chunk:
-                                            yield text_chunk
-                            except Exception as e:
-                                pass
-                except Exception as e:
-                     logger.error(f"Stream Consumption Error: {e}")
-                     pass
-            
+        async with AsyncExitStack() as stack:
+            # The permit only covers opening the request: held across yields, a stalled SSE client would pin it
+            async with self._gemini_sem:
+                response = await stack.enter_async_context(
+                    self.client.stream("POST", url, content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=settings.GEMINI_TIMEOUT_CHAIRMAN)
+                )
+            if response.status_code != 200:
+                error_body = await response.aread()
+                logger.error(f"Gemini Streaming Error ({response.status_code}): {error_body.decode()}")
+                error_text = f"[Error: {response.status_code}]"
+                yield error_text.encode() if raw else error_text
+                return
+
+            try:
+                # Scan SSE bytes directly; each 'data:' line holds one JSON frame
+                buf = bytearray()
+                async for piece in response.aiter_bytes(8192):
+                    buf += piece
+                    start = 0
+                    while True:
+                        end = buf.find(b"\n", start)
+                        if end == -1:
+                            break
+                        line = bytes(buf[start:end]).strip()
+                        start = end + 1
+                        if line.startswith(b"data:"):
+                            text_chunk = _extract_stream_text(line[5:].lstrip(), raw)
+                            if text_chunk:
+                                yield text_chunk
+                    del buf[:start]
             
+                line = bytes(buf).strip()
+                if line.startswith(b"data:"):
+                    text_chunk = _extract_stream_text(line[5:].lstrip(), raw)
+                    if text_chunk:
+                        yield text_chunk
+            except Exception as e:
+                 logger.error(f"Stream Consumption Error: {e}")
+                 pass
+        
+        
     # async def _generate_followup_questions(self, context_text: str) -> List[str]:
     #     """
     #     REMOVED: Integrated into Single Pass Stream.
@@ -538,98 +1046,123 @@ class CouncilService:
     async def _generate_and_stream_response(self, model: str, system_prompt: str, user_prompt: str, enable_search: bool) -> None:
         """
         Unified helper with Stream Splitting logic to extracting follow-ups from a single pass.
+        `system_prompt` must already include PROMPT_FOLLOWUP_INSTRUCTION (see the _SYS_*_WITH_FOLLOWUP prompts).
         """
-        full_answer = ""
-        separator = settings.FOLLOWUP_SEPARATOR
+        full_answer_parts = []
+        # Chunks stay JSON-escaped bytes end to end; the separator is matched in its escaped form
+        separator = orjson.dumps(settings.FOLLOWUP_SEPARATOR)[1:-1]
         separator_len = len(separator)
+        # Bytes held back after each chunk: enough to hold a separator split across chunks
+        holdback = separator_len - 1
         
         # Inject Follow-up Instruction
         # We inject it into BOTH system and user prompt to ensure adherence
-        system_prompt += settings.PROMPT_FOLLOWUP_INSTRUCTION
+        # (callers pass a precomposed system prompt that already ends with it)
         user_prompt_with_instruction = f"{user_prompt}\n\n{settings.PROMPT_FOLLOWUP_INSTRUCTION}"
         
-        buffer = ""
+        # Only the unyielded tail is rescanned with each new chunk, never the whole answer
+        tail = b""
         found_separator = False
-        followup_buffer = ""
+        followup_parts = []
+        
+        # Small model chunks are coalesced into one token frame by size or elapsed time
+        loop = asyncio.get_running_loop()
+        pending = []
+        pending_len = 0
+        last_flush = loop.time()
+        flush_after = settings.STREAM_FLUSH_MS / 1000
         
         # DEBUG: Track token count
         token_count = 0
         
-        async for chunk in self._stream_call_gemini(model, system_prompt, user_prompt_with_instruction, enable_search=enable_search):
-            # logger.info(f"[StreamDebug] Chunk received: {len(chunk)} chars")
-            buffer += chunk
-            
+        async for chunk in self._stream_call_gemini(model, system_prompt, user_prompt_with_instruction, enable_search=enable_search, raw=True):
+            # logger.info(f"[StreamDebug] Chunk received: {len(chunk)} bytes")
             if found_separator:
-                followup_buffer += chunk
+                followup_parts.append(chunk)
                 continue
-                
-            # Check for separator in buffer
-            if separator in buffer:
+            
+            probe = tail + chunk
+            idx = probe.find(separator)
+            
+            if idx >= 0:
                 found_separator = True
-                # Split
-                parts = buffer.split(separator)
-                safe_text = parts[0]
-                followup_text = parts[1]
+                safe_text = probe[:idx]
                 
-                # Yield the safe text (final answer part)
-                if safe_text:
-                    full_answer += safe_text
+                # Yield the safe text (final answer part) along with anything pending
+                full_answer_parts.append(safe_text)
+                pending.append(safe_text)
+                batch = b"".join(pending)
+                pending.clear()
+                pending_len = 0
+                if batch:
                     token_count += 1
                     if token_count == 1:
                         logger.info("[StreamDebug] FIRST TOKEN YIELDED from Splitter")
-                    yield f"token: {json.dumps(safe_text)}\n"
+                    yield f'token: "{batch.decode()}"\n'
                 
                 logger.info("[StreamDebug] Separator found! Switching to followup collection.")
                 
                 # Start collecting followups
-                followup_buffer = followup_text
-                # Clear buffer (not needed, but good practice)
-                buffer = "" 
+                followup_parts.append(probe[idx + separator_len:])
+                tail = b""
                 continue
             
             # Streaming logic with safety buffer
-            # We must keep enough chars in buffer to cover partial separator
             # E.g. separator is "+++FOLLOW_UP+++" (15 chars)
-            # If buffer is "Safe text... +++FO", we can yield "Safe text... "
-            
-            if len(buffer) > separator_len:
-                # Yield the SAFE part, keep the TAIL
-                safe_chunk = buffer[:-separator_len]
-                buffer = buffer[-separator_len:] # Keep tail
+            # If probe is "Safe text... +++FO", we can yield "Safe text... " and hold "+++FO"
+            # (never cutting through an escape sequence or a multi-byte character)
+            cut = _escaped_cut(probe, len(probe) - holdback) if len(probe) > holdback else 0
+            if cut > 0:
+                safe_chunk = probe[:cut]
+                tail = probe[cut:]
+                
+                full_answer_parts.append(safe_chunk)
+                pending.append(safe_chunk)
+                pending_len += len(safe_chunk)
                 
-                full_answer += safe_chunk
-                token_count += 1
-                if token_count == 1:
-                     logger.info("[StreamDebug] FIRST TOKEN YIELDED from Buffer")
-                yield f"token: {json.dumps(safe_chunk)}\n"
+                now = loop.time()
+                if pending_len >= settings.STREAM_FLUSH_CHARS or now - last_flush >= flush_after:
+                    batch = b"".join(pending)
+                    pending.clear()
+                    pending_len = 0
+                    last_flush = now
+                    token_count += 1
+                    if token_count == 1:
+                         logger.info("[StreamDebug] FIRST TOKEN YIELDED from Buffer")
+                    yield f'token: "{batch.decode()}"\n'
+            else:
+                tail = probe
         
         # End of Stream
         logger.info(f"[StreamDebug] Stream ended. Tokens yielded: {token_count}. Separator found: {found_separator}")
 
-        yield f"log: ✓ Response generated.\n"
+        yield _LOG_RESPONSE_DONE
         
         # If separator was never found (model ignored instruction), flush buffer as text
-        if not found_separator and buffer:
+        if not found_separator and (tail or pending):
              logger.warning("[StreamDebug] Separator NOT found. Flushing remaining buffer.")
-             full_answer += buffer
-             yield f"token: {json.dumps(buffer)}\n"
+             full_answer_parts.append(tail)
+             pending.append(tail)
+             yield f"token: {orjson.dumps(_decode_escaped(b''.join(pending))).decode()}\n"
+        
+        # Decoded once, at the end, instead of per chunk
+        full_answer = _decode_escaped(b"".join(full_answer_parts))
+        followup_buffer = _decode_escaped(b"".join(followup_parts))
              
         # Process Follow-ups
         if followup_buffer:
              logger.info(f"Parsing integrated follow-up questions... Buffer len: {len(followup_buffer)}")
-             yield f"log: Parsing integrated follow-up questions...\n"
-             questions = [line.strip() for line in followup_buffer.split('\n') if line.strip() and '?' in line]
-             # Basic cleanup
-             questions = [q.lstrip("1234567890.-•* ") for q in questions][:3]
+             yield _LOG_PARSING_FOLLOWUPS
+             questions = _FOLLOWUP_RE.findall(followup_buffer)[:3]
              
              if questions:
                  logger.info(f"Generated follow-ups: {questions}")
-                 yield f"followup: {json.dumps(questions)}\n"
+                 yield f"followup: {orjson.dumps(questions).decode()}\n"
              else:
                  logger.warning("Follow-up buffer had content but no questions parsed.")
                  
         # Final Data Event
-        yield f"data: {json.dumps({'answer': full_answer})}\n"
+        yield f"data: {orjson.dumps({'answer': full_answer}).decode()}\n"
 
 
     async def deliberate(self, query: str, context: str = "") -> Dict[str, Any]:
@@ -643,21 +1176,22 @@ class CouncilService:
         
         # We start a new conversation context for this one-off request
         async for event in self.deliberate_stream(query, chat_history=[], enable_web_search=False):
-            clean_event = event.strip()
+            # Only 'data:' and 'opinion:' frames carry JSON we need; skip everything else unparsed
+            event_type, _, body = event.strip().partition(":")
+            if event_type not in ("data", "opinion") or not body:
+                continue
             
-            if clean_event.startswith("data:"):
-                import json
-                try:
-                    data = json.loads(clean_event[5:])
-                    if "answer" in data:
-                        final_answer += data["answer"] # Although usually atomic in stream
-                except: pass
+            try:
+                payload = orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"[Council] Skipping malformed '{event_type}' event: {e}")
+                continue
             
-            elif clean_event.startswith("opinion:"):
-                import json
-                try:
-                    opinions.append(json.loads(clean_event[8:]))
-                except: pass
+            if event_type == "data":
+                if "answer" in payload:
+                    final_answer += payload["answer"] # Although usually atomic in stream
+            else:
+                opinions.append(payload)
 
         return {
             "query": query,
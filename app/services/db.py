@@ -2,8 +2,27 @@
 from supabase import create_client, Client
 from app.config import settings
 from app.logger import logger
+from collections import OrderedDict
 from typing import Optional, Dict, List
-import datetime
+import queue
+import threading
+import time
+import uuid
+
+# (second, "YYYY-MM-DDTHH:MM:SS") for the last formatted second, so hot-path timestamps only format microseconds
+_iso_second = (None, "")
+
+def _utc_iso(micros: int = None) -> str:
+    """UTC ISO-8601 timestamp (same shape as datetime.isoformat()) for epoch microseconds, default now"""
+    global _iso_second
+    if micros is None:
+        micros = time.time_ns() // 1000
+    second, fraction = divmod(micros, 1_000_000)
+    cached_second, prefix = _iso_second
+    if cached_second != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second = (second, prefix)
+    return f"{prefix}.{fraction:06d}+00:00"
 
 class DatabaseService:
     def __init__(self):
@@ -11,6 +30,31 @@ class DatabaseService:
             settings.SUPABASE_URL, 
             settings.SUPABASE_SERVICE_KEY
         )
+        
+        # Write-behind queue for messages nobody reads back immediately (see enqueue_message)
+        self._pending_messages: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._queued_counts: Dict[str, int] = {}  # conversation_id -> queued messages not yet written
+        self._queued_cond = threading.Condition()
+        self._last_created_at: OrderedDict[str, int] = OrderedDict()  # conversation_id -> last stamped created_at (epoch microseconds), LRU
+    
+    def _next_created_at(self, conversation_id: str) -> str:
+        """
+        created_at for a new message, strictly increasing per conversation. Every chat-turn row is stamped
+        here on the app clock, so a reply can never sort before its question through DB/app clock skew.
+        """
+        with self._writer_lock:
+            created_at = time.time_ns() // 1000
+            last = self._last_created_at.get(conversation_id)
+            if last is not None and created_at <= last:
+                created_at = last + 1
+            self._last_created_at[conversation_id] = created_at
+            self._last_created_at.move_to_end(conversation_id)
+            # Only idle conversations are forgotten; by then the wall clock has moved past their last row
+            while len(self._last_created_at) > settings.DB_CREATED_AT_TRACK_MAX:
+                self._last_created_at.popitem(last=False)
+        return _utc_iso(created_at)
     
     def create_conversation(self, user_id: str, title: str = "New Conversation", id: str = None) -> str:
         """Creates a new conversation and returns its ID."""
@@ -45,12 +89,135 @@ class DatabaseService:
                 return response.data[0]['id']
             raise Exception("Failed to add message")
         except Exception as e:
-            # Suppress logging for expected Foreign Key errors (e.g. when chat.py needs to create a conversation)
-            if "23503" in str(e) or "foreign key constraint" in str(e).lower():
-                raise
             logger.error(f"Error adding message: {e}")
             raise
 
+    def append_message_ensure_conv(self, conversation_id: str, user_id: str, role: str, content: str, title: str = None, metadata: Optional[Dict] = None) -> str:
+        """
+        Adds a message, creating the conversation (with the given ID) if it does not exist yet.
+        One round trip via the append_message_ensure_conv RPC (migrations/003).
+        """
+        try:
+            response = self.supabase.rpc("append_message_ensure_conv", {
+                "p_user_id": user_id,
+                "p_conv_id": conversation_id,
+                "p_title": title,
+                "p_role": role,
+                "p_content": content,
+                "p_metadata": metadata or {},
+                "p_created_at": self._next_created_at(conversation_id)
+            }).execute()
+            if response.data:
+                return response.data
+            raise Exception("Failed to add message")
+        except Exception as e:
+            logger.error(f"Error adding message: {e}")
+            raise
+
+    def enqueue_message(self, conversation_id: str, user_id: str, role: str, content: str, metadata: Optional[Dict] = None) -> str:
+        """
+        Fire-and-forget variant of add_message: queues the row for a batched insert and returns
+        its client-generated ID immediately. Use it only where the write needs no error handling
+        and is not read back right away (e.g. the assistant reply at the end of a turn).
+        """
+        message_id = str(uuid.uuid4())
+        # Stamped at enqueue time so batching never reorders a thread
+        created_at = self._next_created_at(conversation_id)
+        with self._queued_cond:
+            self._queued_counts[conversation_id] = self._queued_counts.get(conversation_id, 0) + 1
+        self._pending_messages.put({
+            "id": message_id,
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "role": role,
+            "content": content,
+            "metadata": metadata or {},
+            "created_at": created_at,
+        })
+        self._ensure_writer()
+        return message_id
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._flush_loop, name="db-writer", daemon=True)
+                self._writer.start()
+
+    def _flush_loop(self):
+        """Drains the message queue, inserting up to DB_WRITE_BATCH_SIZE rows per round trip"""
+        while True:
+            item = self._pending_messages.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + settings.DB_WRITE_BATCH_MS / 1000
+            while len(batch) < settings.DB_WRITE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._pending_messages.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._insert_batch(batch)
+            self._mark_written(batch)
+            if stop:
+                return
+
+    def _insert_batch(self, batch: List[Dict]):
+        try:
+            self.supabase.table("messages").insert(batch).execute()
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Error adding queued message {batch[0]['id']}: {e}")
+                return
+            # One bad row (e.g. a deleted conversation) fails the whole insert: retry rows individually
+            logger.warning(f"Batched message insert failed ({len(batch)} rows), retrying individually: {e}")
+            for row in batch:
+                self._insert_batch([row])
+
+    def flush_messages(self):
+        """Writes out all queued messages and stops the writer (called on shutdown)"""
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            self._pending_messages.put(None)
+            writer.join()
+        # Anything queued after the writer stopped
+        leftover = []
+        while not self._pending_messages.empty():
+            item = self._pending_messages.get_nowait()
+            if item is not None:
+                leftover.append(item)
+        for start in range(0, len(leftover), settings.DB_WRITE_BATCH_SIZE):
+            self._insert_batch(leftover[start:start + settings.DB_WRITE_BATCH_SIZE])
+        self._mark_written(leftover)
+
+    def _mark_written(self, batch: List[Dict]):
+        """Settles queued rows (written or given up on) and wakes wait_for_queued_messages"""
+        with self._queued_cond:
+            for row in batch:
+                remaining = self._queued_counts.get(row["conversation_id"], 0) - 1
+                if remaining > 0:
+                    self._queued_counts[row["conversation_id"]] = remaining
+                else:
+                    self._queued_counts.pop(row["conversation_id"], None)
+            self._queued_cond.notify_all()
+
+    def has_queued_messages(self, conversation_id: str) -> bool:
+        return conversation_id in self._queued_counts
+
+    def wait_for_queued_messages(self, conversation_id: str, timeout: float = 5.0) -> bool:
+        """Blocks until the conversation's queued messages are written, so a history read sees them"""
+        with self._queued_cond:
+            return self._queued_cond.wait_for(lambda: conversation_id not in self._queued_counts, timeout)
+
     def delete_message(self, message_id: str) -> bool:
         """Hard deletes a specific message."""
         try:
@@ -92,8 +259,7 @@ class DatabaseService:
             if not data:
                 return False
 
-            data["updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-
+            # updated_at is stamped by the conversations_set_updated_at trigger on renames (migrations/003)
             response = self.supabase.table("conversations")\
                 .update(data)\
                 .eq("id", conversation_id)\
@@ -107,24 +273,26 @@ class DatabaseService:
             logger.error(f"Error updating conversation: {e}")
             raise
 
-    def get_conversation_history(self, conversation_id: str, user_id: str, limit: int = 50) -> List[Dict]:
-        """Retrieves conversation history, ensuring user owns it."""
+    def get_conversation_history(self, conversation_id: str, user_id: str, limit: int = 50, include_metadata: bool = False) -> List[Dict]:
+        """
+        Retrieves conversation history, ensuring user owns it.
+        Only the columns the chat pipeline reads are fetched; metadata (often the widest column) is opt-in.
+        """
         try:
-            # First verify ownership (optional if RLS is trusted, but good for backend logic)
-            # We fetch messages ordered by created_at DESC (newest first) to get the LAST N messages.
-            
-            # Fetch messages
+            # We fetch messages ordered by created_at DESC (newest first) so the LIMIT keeps the LAST N messages.
+            columns = "id,role,content,created_at,metadata" if include_metadata else "id,role,content,created_at"
             response = self.supabase.table("messages")\
-                .select("*")\
+                .select(columns)\
                 .eq("conversation_id", conversation_id)\
                 .eq("user_id", user_id)\
                 .order("created_at", desc=True)\
                 .limit(limit)\
                 .execute()
             
-            # Return reversed list (Chronological order: Oldest -> Newest)
+            # Chronological order: Oldest -> Newest
             if response.data:
-                return response.data[::-1]
+                response.data.reverse()
+                return response.data
             return []
         except Exception as e:
             logger.error(f"Error fetching history: {e}")
@@ -156,7 +324,7 @@ class DatabaseService:
         try:
             data = {
                 "status": status,
-                "updated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "updated_at": _utc_iso(),
             }
             if analysis_json is not None:
                 data["analysis"] = analysis_json
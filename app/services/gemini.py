@@ -1,7 +1,26 @@
 import httpx
+import orjson
+from typing import AsyncIterator
 from app.config import settings
 from app.logger import logger
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_PROMPT_HEAD = """You are a legal assistant AI trained on Indian Laws.
+
+Use ONLY the following retrieved legal document text to answer the user query.
+If the answer is not present in the context, say: "Not found in retrieved documents."
+
+CONTEXT:
+"""
+_PROMPT_MID = """
+
+QUERY:
+"""
+_PROMPT_TAIL = """
+
+Provide a clear, concise answer with references (chapter, section, etc.)."""
+
 class GeminiService:
     """Gemini service using REST API (bypasses gRPC issues)"""
     
@@ -10,47 +29,61 @@ class GeminiService:
         self.api_key = settings.GEMINI_API_KEY
         self.model = settings.GEMINI_MODEL
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self._client = None
         logger.info(" Gemini service ready")
     
-    def generate(self, query: str, context: str) -> str:
-        """Generate answer using Gemini REST API"""
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP/2 client (connection reuse across generate calls)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+    
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _payload(self, query: str, context: str) -> dict:
+        # Static head first so every request shares the same prefix (server-side prefix caching)
+        prompt = "".join((_PROMPT_HEAD, context, _PROMPT_MID, query, _PROMPT_TAIL))
+        return {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }]
+        }
+    
+    async def generate_stream(self, query: str, context: str) -> AsyncIterator[str]:
+        """Yields answer text as Gemini produces it (streamGenerateContent over SSE)"""
         try:
-            logger.info(f" Generating answer with Gemini (REST)...")
+            logger.info(f" Streaming answer with Gemini (REST)...")
             logger.debug(f"Context length: {len(context)} chars")
             
-            prompt = f"""You are a legal assistant AI trained on Indian Laws.
-
-Use ONLY the following retrieved legal document text to answer the user query.
-If the answer is not present in the context, say: "Not found in retrieved documents."
-
-CONTEXT:
-{context}
-
-QUERY:
-{query}
-
-Provide a clear, concise answer with references (chapter, section, etc.)."""
-
-            url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
-            
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }]
-            }
+            url = f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
             
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(url, json=payload)
+            async with self.client.stream("POST", url, content=orjson.dumps(self._payload(query, context)), headers=_JSON_HEADERS) as response:
                 response.raise_for_status()
-                
-            result = response.json()
-            answer = result["candidates"][0]["content"]["parts"][0]["text"]
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = orjson.loads(line[5:])
+                    for candidate in chunk.get("candidates", []):
+                        for part in candidate.get("content", {}).get("parts", []):
+                            if part.get("text"):
+                                yield part["text"]
             
-            logger.info(" Answer generated successfully")
-            return answer
+            logger.info(" Answer streamed successfully")
             
         except Exception as e:
             logger.error(f" Gemini generation failed: {str(e)}", exc_info=True)
             raise
+    
+    async def generate(self, query: str, context: str) -> str:
+        """Generate answer using Gemini REST API (collects generate_stream)"""
+        return "".join([text async for text in self.generate_stream(query, context)])
 
 gemini_service = GeminiService()
\ No newline at end of file
@@ -1,7 +1,74 @@
+import asyncio
 import httpx
-from qdrant_client import QdrantClient
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from app.config import settings
 from app.logger import logger
+from app.services.retrieval_cache import embedding_cache, query_cache
+
+# Embedding requests/responses (2048-float arrays) go through orjson rather than httpx's stdlib json
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Payload fields that mark a point as a case judgment
+_CASE_KEYS = frozenset(('petitioner', 'respondent'))
+
+# (normalized field, payload keys tried in order, default) -- the frontend expects these names
+_CASE_FIELDS = (
+    ('case_name', ('title',), 'Untitled Judgment'),
+    ('petitioner', ('petitioner',), ''),
+    ('respondent', ('respondent',), ''),
+    ('case_number', ('case_number',), ''),
+    ('case_type', ('case_type',), ''),
+    ('court', ('court',), 'Supreme Court'),
+    ('date', ('date',), 'Unknown Date'),
+    ('year', ('year',), ''),
+    ('url', ('url',), ''),
+    ('text', ('text',), ''),
+)
+
+_STATUTE_FIELDS = (
+    ('law', ('act_title', 'law'), 'Unknown Act'),
+    ('act_id', ('act_id',), ''),
+    ('chapter_title', ('chapter_name', 'chapter_title'), ''),
+    ('year', ('year',), ''),
+    ('enactment_date', ('enactment_date',), ''),
+    ('url', ('url',), None),
+    ('text', ('text',), ''),
+)
+
+# Payload fields read by _normalize_metadata/_points_to_chunks; Qdrant returns only these.
+# summary is a multi-KB nested object, so only its sub-fields that are used are projected.
+_PAYLOAD_FIELDS = sorted(
+    {key for _, keys, _ in _CASE_FIELDS + _STATUTE_FIELDS for key in keys}
+    | {'citation_refs', 'bench', 'section_numbers', 'section_titles', 'section_number', 'section_title',
+       'summary.executive_summary', 'summary.facts', 'summary.judgment'}
+)
+
+def _pack(embedding: list) -> np.ndarray:
+    """Cache form of an embedding: unit-normalized float16 (4 KB instead of ~64 KB of Python floats)"""
+    vec = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec /= norm
+    return vec.astype(np.float16)
+
+def _unpack(vec: np.ndarray) -> np.ndarray:
+    """Query form: a contiguous float32 array, passed to query_points as-is"""
+    return vec.astype(np.float32)
+
+def _first(payload: dict, keys: tuple, default):
+    """Value of the first key present in payload (mirrors nested dict.get fallbacks)"""
+    for key in keys:
+        if key in payload:
+            return payload[key]
+    return default
+
+def _joined(value) -> str:
+    if isinstance(value, list):
+        return ", ".join([str(x) for x in value if x is not None])
+    return str(value or '')
 
 class QdrantService:
     """Qdrant service with REST-based embedding and Dual-Collection Support"""
@@ -9,15 +76,28 @@ class QdrantService:
     def __init__(self):
         logger.info(" Initializing Qdrant service (lazy mode)...")
         self._client = None
+        self._async_client = None
+        self._http = None
+        self._sync_http = None
+        self._prefer_grpc = settings.QDRANT_PREFER_GRPC  # Cleared by warmup() if the gRPC channel can't be opened
         self.api_key = settings.GEMINI_API_KEY
         self.embed_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-embedding-001:embedContent"
+        self.batch_embed_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-embedding-001:batchEmbedContents"
         
         # Collection names from config
         self.collection_statutes = settings.QDRANT_COLLECTION_STATUTES
         self.collection_cases = settings.QDRANT_COLLECTION_CASES
         
+        # Fans out per-collection queries that share one embedding
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="qdrant")
+        
         logger.info(f" Qdrant Configured with: Statutes='{self.collection_statutes}', Cases='{self.collection_cases}'")
     
+    @property
+    def _with_payload(self):
+        """Payload projection for query_points (everything when the raw payload is kept for debugging)"""
+        return True if settings.QDRANT_KEEP_RAW_PAYLOAD else _PAYLOAD_FIELDS
+    
     @property
     def client(self):
         """Lazy initialization of Qdrant client"""
@@ -27,6 +107,7 @@ class QdrantService:
                 self._client = QdrantClient(
                     url=settings.QDRANT_URL, 
                     api_key=settings.QDRANT_API_KEY,
+                    prefer_grpc=self._prefer_grpc,
                     timeout=10
                 )
                 logger.info(" Qdrant client connected")
@@ -35,129 +116,238 @@ class QdrantService:
                 raise
         return self._client
     
-    def _get_embedding(self, text: str) -> list:
-        """Get embedding using Gemini REST API"""
-        url = f"{self.embed_url}?key={self.api_key}"
+    @property
+    def async_client(self):
+        """Lazy initialization of the async Qdrant client (used from the event loop)"""
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY,
+                prefer_grpc=self._prefer_grpc,
+                timeout=10
+            )
+        return self._async_client
+    
+    async def _ping(self):
+        """Opens both Qdrant channels (async for the event loop, sync for executor threads)"""
+        collections = await self.async_client.get_collections()
+        await asyncio.to_thread(lambda: self.client.get_collections())
+        return len(collections.collections)
+    
+    async def warmup(self):
+        """
+        Connects to Qdrant ahead of the first query (called at startup).
+        Searches swallow errors and return [], so a dead gRPC channel would silently drop all sources:
+        switch both clients back to REST instead.
+        """
+        try:
+            count = await self._ping()
+            logger.info(f" [Qdrant] Warmed up over {'gRPC' if self._prefer_grpc else 'REST'} ({count} collections)")
+            return
+        except Exception as e:
+            if not self._prefer_grpc:
+                logger.error(f" [Qdrant] Warmup failed, Qdrant unreachable - searches will return no sources: {e}")
+                return
+            logger.error(f" [Qdrant] gRPC channel failed, falling back to REST: {e}")
         
-        payload = {
+        self._prefer_grpc = False
+        await self._close_clients()
+        try:
+            count = await self._ping()
+            logger.info(f" [Qdrant] Warmed up over REST ({count} collections)")
+        except Exception as e:
+            logger.error(f" [Qdrant] Warmup failed, Qdrant unreachable - searches will return no sources: {e}")
+    
+    @property
+    def http(self):
+        """Shared async HTTP client for embedding requests"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._http
+    
+    @property
+    def sync_http(self):
+        """Shared pooled HTTP client for the synchronous search path (executor threads)"""
+        if self._sync_http is None:
+            self._sync_http = httpx.Client(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+            )
+        return self._sync_http
+    
+    async def _close_clients(self):
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+    
+    async def close(self):
+        await self._close_clients()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._sync_http is not None:
+            self._sync_http.close()
+            self._sync_http = None
+    
+    def _embedding_payload(self, text: str) -> dict:
+        return {
             "model": "models/gemini-embedding-001",
             "content": {"parts": [{"text": text}]},
             "taskType": "RETRIEVAL_QUERY",
             "outputDimensionality": 2048
         }
+    
+    def _parse_embedding(self, result: dict) -> list:
+        return self._check_dimensions(result["embedding"]["values"])
+    
+    def _check_dimensions(self, embedding: list) -> list:
+        if len(embedding) != 2048:
+            logger.warning(f" Expected 2048 dimensions, got {len(embedding)}!")
+        
+        return embedding
+    
+    def _get_embedding(self, text: str) -> np.ndarray:
+        """Get embedding using Gemini REST API (cached per exact text)"""
+        key = embedding_cache.make_text_key(text)
+        return _unpack(embedding_cache.get_or_compute(key, lambda: _pack(self._request_embedding(text))))
+    
+    def _request_embedding(self, text: str) -> list:
+        url = f"{self.embed_url}?key={self.api_key}"
         
         # logger.debug(f" Requesting embedding for: {text[:20]}...")
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, json=payload)
+        response = self.sync_http.post(url, content=orjson.dumps(self._embedding_payload(text)), headers=_JSON_HEADERS)
+        response.raise_for_status()
+        
+        return self._parse_embedding(orjson.loads(response.content))
+    
+    async def _aget_embedding(self, text: str) -> np.ndarray:
+        """Async variant of _get_embedding (shares its cache)"""
+        key = embedding_cache.make_text_key(text)
+        packed = embedding_cache.get(key)
+        if packed is None:
+            url = f"{self.embed_url}?key={self.api_key}"
+            response = await self.http.post(url, content=orjson.dumps(self._embedding_payload(text)), headers=_JSON_HEADERS)
             response.raise_for_status()
+            packed = _pack(self._parse_embedding(orjson.loads(response.content)))
+            embedding_cache.set(key, packed)
+        return _unpack(packed)
+    
+    async def _aget_embeddings_batch(self, texts: list) -> list:
+        """
+        Embeddings for several texts: cache hits are reused and the rest are fetched
+        with one batchEmbedContents round trip. Results are returned in input order.
+        """
+        packed = {text: embedding_cache.get(embedding_cache.make_text_key(text)) for text in texts}
+        missing = [text for text, vec in packed.items() if vec is None]
         
-        result = response.json()
-        embedding = result["embedding"]["values"]
+        if len(missing) == 1:
+            return [await self._aget_embedding(text) if text in missing else _unpack(packed[text]) for text in texts]
         
-        if len(embedding) != 2048:
-            logger.warning(f" Expected 2048 dimensions, got {len(embedding)}!")
+        if missing:
+            url = f"{self.batch_embed_url}?key={self.api_key}"
+            response = await self.http.post(
+                url,
+                content=orjson.dumps({"requests": [self._embedding_payload(text) for text in missing]}),
+                headers=_JSON_HEADERS
+            )
+            response.raise_for_status()
+            for text, item in zip(missing, orjson.loads(response.content)["embeddings"]):
+                packed[text] = _pack(self._check_dimensions(item["values"]))
+                embedding_cache.set(embedding_cache.make_text_key(text), packed[text])
         
-        return embedding
+        return [_unpack(packed[text]) for text in texts]
     
     def _normalize_metadata(self, payload: dict) -> dict:
         """
         Normalize metadata from diverse Qdrant collections.
         """
-        # 1. Check for Case Law Structure (Field 'petitioner' or 'court' usually indicates case)
-        if 'petitioner' in payload or 'respondent' in payload or 'judgment' in payload.get('summary', {}):
-            # It's a Case Judgment
-            # Get Summary
-            summary_obj = payload.get('summary', {})
-            executive_summary = summary_obj.get('executive_summary', '') if isinstance(summary_obj, dict) else ""
-            
-            # Construct text content if missing or if we want summary
-            # User prefers "relevant part... proper summary"
-            text_content = payload.get('text', '')
-            if not text_content and executive_summary:
-                 text_content = f"**Summary**: {executive_summary}"
-
-            return {
-                'source_type': 'case_law',
-                'case_name': payload.get('title', 'Untitled Judgment'), # Frontend expects case_name
-                'petitioner': payload.get('petitioner', ''),
-                'respondent': payload.get('respondent', ''),
-                'case_number': payload.get('case_number', ''),
-                'case_type': payload.get('case_type', ''),
-                'court': payload.get('court', 'Supreme Court'),
-                'date': payload.get('date', 'Unknown Date'),
-                'year': payload.get('year', ''),
-                'url': payload.get('url', ''),
-                'citation': ", ".join([str(x) for x in payload.get('citation_refs', []) if x is not None]) if isinstance(payload.get('citation_refs'), list) else str(payload.get('citation_refs', '') or ''),
-                'bench': ", ".join([str(x) for x in payload.get('bench', []) if x is not None]) if isinstance(payload.get('bench'), list) else str(payload.get('bench', '') or ''),
-                'text': text_content, # Normalized text field
-                # Keep raw
-                'full_metadata': payload
-            }
+        summary_obj = payload.get('summary', {})
+        
+        # 1. Case Law Structure (petitioner/respondent fields, or a summary carrying the judgment)
+        if not _CASE_KEYS.isdisjoint(payload.keys()) or 'judgment' in summary_obj:
+            metadata = {'source_type': 'case_law'}
+            metadata.update((name, _first(payload, keys, default)) for name, keys, default in _CASE_FIELDS)
+            metadata['citation'] = _joined(payload.get('citation_refs', ''))
+            metadata['bench'] = _joined(payload.get('bench', ''))
             
-        # 2. Check for Statute/Act Structure
+            # Construct text content if missing (User prefers "relevant part... proper summary")
+            executive_summary = summary_obj.get('executive_summary', '') if isinstance(summary_obj, dict) else ""
+            if not metadata['text'] and executive_summary:
+                metadata['text'] = f"**Summary**: {executive_summary}"
+        
+        # 2. Statute/Act Structure
         else:
-            # It's a Statute
-            # Cleanup array fields
+            metadata = {'source_type': 'statute'}
+            metadata.update((name, _first(payload, keys, default)) for name, keys, default in _STATUTE_FIELDS)
+            
+            # Array fields win over their singular counterparts
             sect_num = payload.get('section_numbers', [])
             sect_title = payload.get('section_titles', [])
-            
             if isinstance(sect_num, list): sect_num = ", ".join(map(str, sect_num))
             if isinstance(sect_title, list): sect_title = ", ".join(map(str, sect_title))
+            metadata['section_number'] = sect_num or str(payload.get('section_number', ''))
+            metadata['section_title'] = sect_title or payload.get('section_title', '')
+        
+        if settings.QDRANT_KEEP_RAW_PAYLOAD:
+            metadata['full_metadata'] = payload
+        return metadata
+
+    def _points_to_chunks(self, points) -> list:
+        chunks = []
+        for i, point in enumerate(points, 1):
+            payload = point.payload
+            metadata = self._normalize_metadata(payload)
+            
+            # IMPORTANT: For cases, the text might be in 'summary.executive_summary' or 'text' field
+            # The user payload shows 'summary' key having structured summaries.
+            # But Qdrant points usually have a 'text' field for RAG. 
+            # If 'text' is missing, fallback to formatted summary.
+            
+            content_text = payload.get("text", "")
+            if not content_text and metadata['source_type'] == 'case_law':
+                 # Synthesize text from summary if main text missing
+                 summ = payload.get('summary', {})
+                 if isinstance(summ, dict):
+                     content_text = f"HEADNOTE: {summ.get('executive_summary', '')}\n\nFACTS: {summ.get('facts', '')}\n\nHELD: {summ.get('judgment', '')}"
             
-            return {
-                'source_type': 'statute',
-                'law': payload.get('act_title', payload.get('law', 'Unknown Act')), # Frontend expects 'law'
-                'act_id': payload.get('act_id', ''),
-                'section_number': sect_num or str(payload.get('section_number', '')),
-                'section_title': sect_title or payload.get('section_title', ''),
-                'chapter_title': payload.get('chapter_name', payload.get('chapter_title', '')),
-                'year': payload.get('year', ''),
-                'enactment_date': payload.get('enactment_date', ''),
-                'url': payload.get('url', None),
-                'text': payload.get('text', ''), # User wants relevant part, usually 'text' in statute payload IS the section text
-                # Keep raw
-                'full_metadata': payload
-            }
-
-    def search(self, query: str, collection_name: str, top_k: int = 5):
-        """Generic search method"""
+            chunks.append({
+                "rank": i,
+                "score": point.score,
+                "text": content_text,
+                "metadata": metadata
+            })
+        return chunks
+
+    def search(self, query: str, collection_name: str, top_k: int = 5, embedding: np.ndarray = None):
+        """Generic search method (served from the query cache when possible)"""
+        key = query_cache.make_key(collection_name, top_k, query)
+        return query_cache.get_or_compute(key, lambda: self._search_uncached(query, collection_name, top_k, embedding))
+
+    def _search_uncached(self, query: str, collection_name: str, top_k: int, embedding: np.ndarray = None):
         try:
             logger.info(f" [Qdrant] Searching '{collection_name}' for: {query[:40]}...")
             
-            # Embed
-            embedding = self._get_embedding(query)
+            # Embed (unless the caller already did)
+            if embedding is None:
+                embedding = self._get_embedding(query)
             
             # Query
             results = self.client.query_points(
                 collection_name=collection_name,
                 query=embedding,
-                limit=top_k
+                limit=top_k,
+                with_payload=self._with_payload
             )
             
-            chunks = []
-            for i, point in enumerate(results.points, 1):
-                payload = point.payload
-                metadata = self._normalize_metadata(payload)
-                
-                # IMPORTANT: For cases, the text might be in 'summary.executive_summary' or 'text' field
-                # The user payload shows 'summary' key having structured summaries.
-                # But Qdrant points usually have a 'text' field for RAG. 
-                # If 'text' is missing, fallback to formatted summary.
-                
-                content_text = payload.get("text", "")
-                if not content_text and metadata['source_type'] == 'case_law':
-                     # Synthesize text from summary if main text missing
-                     summ = payload.get('summary', {})
-                     if isinstance(summ, dict):
-                         content_text = f"HEADNOTE: {summ.get('executive_summary', '')}\n\nFACTS: {summ.get('facts', '')}\n\nHELD: {summ.get('judgment', '')}"
-                
-                chunks.append({
-                    "rank": i,
-                    "score": point.score,
-                    "text": content_text,
-                    "metadata": metadata
-                })
+            chunks = self._points_to_chunks(results.points)
             
             logger.info(f" [Qdrant] Found {len(chunks)} results in {collection_name}")
             return chunks
@@ -179,4 +369,112 @@ class QdrantService:
             top_k = settings.RAG_TOP_K
         return self.search(query, self.collection_cases, top_k)
 
+    def search_statutes_and_cases(self, query: str, top_k: int = None) -> tuple:
+        """
+        Searches both collections with a single embedding call, querying them concurrently.
+        Returns (statute_chunks, case_chunks).
+        """
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        collections = (self.collection_statutes, self.collection_cases)
+        
+        cached = [query_cache.get(query_cache.make_key(name, top_k, query)) for name in collections]
+        if all(chunks is not None for chunks in cached):
+            return tuple(cached)
+        
+        try:
+            embedding = self._get_embedding(query)
+        except Exception as e:
+            logger.error(f" [Qdrant] Embedding failed: {str(e)}")
+            return [], []
+        
+        futures = [self._executor.submit(self.search, query, name, top_k, embedding) for name in collections]
+        return tuple(f.result() for f in futures)
+
+    async def asearch(self, query: str, collection_name: str, top_k: int = 5, embedding: np.ndarray = None):
+        """Async counterpart of search(), backed by AsyncQdrantClient"""
+        key = query_cache.make_key(collection_name, top_k, query)
+        chunks = query_cache.get(key)
+        if chunks is not None:
+            return chunks
+        
+        try:
+            logger.info(f" [Qdrant] Searching '{collection_name}' for: {query[:40]}...")
+            
+            if embedding is None:
+                embedding = await self._aget_embedding(query)
+            
+            results = await self.async_client.query_points(
+                collection_name=collection_name,
+                query=embedding,
+                limit=top_k,
+                with_payload=self._with_payload
+            )
+            chunks = self._points_to_chunks(results.points)
+            
+            logger.info(f" [Qdrant] Found {len(chunks)} results in {collection_name}")
+        except Exception as e:
+            logger.error(f" [Qdrant] Search failed in {collection_name}: {str(e)}")
+            return []
+        
+        if chunks:
+            query_cache.set(key, chunks)
+        return chunks
+
+    async def asearch_statutes(self, query: str, top_k: int = None):
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        return await self.asearch(query, self.collection_statutes, top_k)
+
+    async def asearch_cases(self, query: str, top_k: int = None):
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        return await self.asearch(query, self.collection_cases, top_k)
+
+    async def asearch_statutes_and_cases(self, query: str, top_k: int = None) -> tuple:
+        """Async counterpart of search_statutes_and_cases()"""
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        collections = (self.collection_statutes, self.collection_cases)
+        
+        cached = [query_cache.get(query_cache.make_key(name, top_k, query)) for name in collections]
+        if all(chunks is not None for chunks in cached):
+            return tuple(cached)
+        
+        try:
+            embedding = await self._aget_embedding(query)
+        except Exception as e:
+            logger.error(f" [Qdrant] Embedding failed: {str(e)}")
+            return [], []
+        
+        return tuple(await asyncio.gather(*(self.asearch(query, name, top_k, embedding) for name in collections)))
+
+    async def asearch_statutes_and_cases_many(self, queries: list, top_k: int = None) -> list:
+        """
+        asearch_statutes_and_cases for several queries: the uncached ones are embedded in a
+        single batch call, then every collection query runs concurrently.
+        Returns one (statute_chunks, case_chunks) tuple per query.
+        """
+        if top_k is None:
+            top_k = settings.RAG_TOP_K
+        collections = (self.collection_statutes, self.collection_cases)
+        
+        to_embed = [
+            query for query in queries
+            if any(query_cache.get(query_cache.make_key(name, top_k, query)) is None for name in collections)
+        ]
+        embeddings = {}
+        if to_embed:
+            try:
+                embeddings = dict(zip(to_embed, await self._aget_embeddings_batch(to_embed)))
+            except Exception as e:
+                logger.error(f" [Qdrant] Batch embedding failed: {str(e)}")
+                return [([], []) for _ in queries]
+        
+        results = await asyncio.gather(*(
+            self.asearch(query, name, top_k, embeddings.get(query))
+            for query in queries for name in collections
+        ))
+        return [tuple(results[i:i + len(collections)]) for i in range(0, len(results), len(collections))]
+
 qdrant_service = QdrantService()
\ No newline at end of file
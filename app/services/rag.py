@@ -1,15 +1,153 @@
+import asyncio
+import re
+import threading
+import numpy as np
+import orjson
+from app.config import settings
+from app.logger import logger
 from app.services.council import council_service
+from app.services.qdrant import qdrant_service
+from app.services.retrieval_cache import QueryCache
 from app.models.schemas import ChatResponse, ChunkResult
 
+# Small talk that never needs retrieval or the council: category -> whole-query pattern
+_SMALL_TALK = (
+    ("greeting", re.compile(r"^\s*(hi+|hello+|hey+|namaste|good\s+(morning|afternoon|evening))\b[\s!.,]*(there|samvidhaan)?[\s!.]*$", re.IGNORECASE)),
+    ("thanks", re.compile(r"^\s*(thanks?( you)?|thank u|thx|ty)\b[\s!.,]*(so much|a lot)?[\s!.]*$", re.IGNORECASE)),
+    ("goodbye", re.compile(r"^\s*(bye+|goodbye|see you|good night)\b[\s!.]*$", re.IGNORECASE)),
+)
+
+_CANNED_ANSWERS = {
+    "greeting": "Hello! I'm Samvidhaan, your assistant for Indian law. Ask me about an Act, a section, or a court judgment.",
+    "thanks": "You're welcome! Let me know if you have any other legal questions.",
+    "goodbye": "Goodbye! Come back any time you have a question about Indian law.",
+    "too_short": "Could you describe your legal question in a little more detail?",
+    "too_long": "Your query is too long. Please shorten it to the key facts and your question.",
+}
+
+# Section / article / act numbers ("302", "437", "21A"): queries differing only in these embed almost identically
+_PROVISION_RE = re.compile(r"\d+[a-z]?", re.IGNORECASE)
+
+def _provisions(query: str) -> frozenset:
+    return frozenset(m.lower() for m in _PROVISION_RE.findall(query))
+
+def _should_bypass(query: str):
+    """Returns the canned-answer category for queries that need no retrieval or LLM calls, else None"""
+    stripped = query.strip()
+    if len(stripped) > settings.DIRECT_MAX_QUERY_CHARS:
+        return "too_long"
+    for category, pattern in _SMALL_TALK:
+        if pattern.match(stripped):
+            return category
+    if len(stripped) < settings.DIRECT_MIN_QUERY_CHARS:
+        return "too_short"
+    return None
+
 class RAGService:
+    def __init__(self):
+        # Final responses, stored as orjson bytes so every hit hands out a fresh copy
+        self._response_cache = QueryCache(max_size=settings.RESPONSE_CACHE_MAX_SIZE, ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+        # Semantic layer: ring buffer of unit-normalized query embeddings, one row per cached response key
+        self._semantic_lock = threading.Lock()
+        self._semantic_matrix = None  # Allocated on first use, once the embedding size is known
+        self._semantic_keys: list = [None] * settings.RESPONSE_CACHE_MAX_SIZE
+        self._semantic_provisions: list = [None] * settings.RESPONSE_CACHE_MAX_SIZE
+        self._semantic_count = 0
+        self._semantic_next = 0
+
+        # Queries currently being answered: response cache key -> task shared by identical requests
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _semantic_candidates(self, embedding: np.ndarray, provisions: frozenset) -> list:
+        """
+        Cache keys of stored queries similar enough to reuse, most similar first. Only queries citing
+        exactly the same section/act numbers qualify ("Section 302 IPC" must not answer "Section 304 IPC").
+        """
+        with self._semantic_lock:
+            if not self._semantic_count:
+                return []
+            scores = self._semantic_matrix[:self._semantic_count] @ embedding
+            rows = np.flatnonzero(scores >= settings.RESPONSE_CACHE_SIMILARITY)
+            rows = rows[np.argsort(-scores[rows])]
+            return [self._semantic_keys[row] for row in rows if self._semantic_provisions[row] == provisions]
+
+    def _semantic_add(self, key: str, embedding: np.ndarray, provisions: frozenset):
+        with self._semantic_lock:
+            if self._semantic_matrix is None:
+                self._semantic_matrix = np.zeros((len(self._semantic_keys), embedding.shape[0]), dtype=np.float32)
+            self._semantic_matrix[self._semantic_next] = embedding
+            self._semantic_keys[self._semantic_next] = key
+            self._semantic_provisions[self._semantic_next] = provisions
+            self._semantic_next = (self._semantic_next + 1) % len(self._semantic_keys)
+            self._semantic_count = min(self._semantic_count + 1, len(self._semantic_keys))
+
+    async def _query_embedding(self, query: str):
+        """Unit-normalized query embedding (served from the embedding cache when possible)"""
+        try:
+            vector = np.asarray(await qdrant_service._aget_embedding(query), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"[RAG] Embedding for response cache failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _cached_response(self, key: str, query: str):
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        return ChatResponse(**{**orjson.loads(cached), "query": query})
+
+    def direct_answer(self, query: str):
+        """Canned reply for small talk and degenerate queries (no retrieval or LLM calls needed), else None"""
+        category = _should_bypass(query)
+        if category:
+            logger.info(f"[RAG] Direct answer ({category}), skipping retrieval and council")
+            return _CANNED_ANSWERS[category]
+        return None
+
     async def process_query(self, query: str, top_k: int = 5) -> ChatResponse:
-        """Main RAG pipeline (Delegates to Council Agent)"""
-        
+        """Main RAG pipeline (Delegates to Council Agent), with exact and semantic response caching"""
+        answer = self.direct_answer(query)
+        if answer:
+            return ChatResponse(query=query, answer=answer, chunks=[], llm_model="direct")
+
+        key = QueryCache.make_key("response", 0, query)
+        response = self._cached_response(key, query)
+        if response:
+            logger.info(f"[RAG] Response cache HIT (exact)")
+            return response
+
+        # Identical queries already being answered share that run instead of starting another
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._answer(query, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info(f"[RAG] Joining in-flight request for the same query")
+        # Shielded so one client disconnecting doesn't cancel the run for the others
+        response = await asyncio.shield(task)
+        return response if response.query == query else response.model_copy(update={"query": query})
+
+    async def _answer(self, query: str, key: str) -> ChatResponse:
+        embedding = None
+        provisions = _provisions(query)
+        if settings.RESPONSE_CACHE_SIMILARITY <= 1:
+            embedding = await self._query_embedding(query)
+        if embedding is not None:
+            # The best row's answer may have expired: fall through to the next qualifying one
+            for match in self._semantic_candidates(embedding, provisions):
+                response = self._cached_response(match, query)
+                if response:
+                    logger.info(f"[RAG] Response cache HIT (semantic)")
+                    return response
+
         # New Flow: Clerk -> Retrieval -> Council -> Chairman
         # Handled internally by council_service
         result = await council_service.deliberate(query)
-        
-        return ChatResponse(
+
+        response = ChatResponse(
             query=query,
             answer=result.get("answer", "No answer generated."),
             chunks=[], # Chunks are handled in streaming only for now, or could be extracted if deliberste returned them
@@ -17,4 +155,12 @@ class RAGService:
             council_opinions=result.get("council_opinions", [])
         )
 
+        # Only complete answers are worth replaying
+        if result.get("answer"):
+            self._response_cache.set(key, orjson.dumps(response.model_dump()))
+            if embedding is not None:
+                self._semantic_add(key, embedding, provisions)
+
+        return response
+
 rag_service = RAGService()
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+import numpy as np
+import orjson
+from app.config import settings
+from app.logger import logger
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with per-entry TTL for retrieval results and query embeddings.
+    Used from executor threads, so all bookkeeping happens under a lock.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl_seconds: float = 600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(collection: str, top_k: int, query: str) -> str:
+        return hashlib.sha1(f"{collection}|{top_k}|{query.strip().lower()}".encode()).hexdigest()
+
+    @staticmethod
+    def make_text_key(text: str) -> str:
+        """Exact-text key (used for embeddings, where the text is sent verbatim)"""
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value or computes it outside the lock.
+        Empty results are not cached (search failures also return []).
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None and len(value):
+            self.set(key, value)
+        return value
+
+    def snapshot(self) -> list[tuple[str, float, Any]]:
+        """Live entries as (key, age_seconds, value), oldest first"""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, now - stored_at, value) for key, (stored_at, value) in self._entries.items() if now - stored_at <= self.ttl_seconds]
+
+    def restore(self, entries: Iterable[tuple[str, float, Any]]):
+        """Re-inserts snapshot entries, keeping their age so TTLs carry over"""
+        now = time.monotonic()
+        with self._lock:
+            for key, age, value in entries:
+                if age <= self.ttl_seconds:
+                    self._entries[key] = (now - age, value)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all entries (call after re-ingesting a collection)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+query_cache = QueryCache(max_size=settings.QDRANT_CACHE_MAX_SIZE, ttl_seconds=settings.QDRANT_CACHE_TTL_SECONDS)
+embedding_cache = QueryCache(max_size=settings.EMBEDDING_CACHE_MAX_SIZE, ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS)
+
+
+def save_embedding_cache(path: str = None):
+    """
+    Snapshots embedding_cache to <path>.npy (stacked float16 rows) + <path>.json ({key: [row, age]}).
+    Files are written aside and swapped in, since the live cache may still be mapped from the old ones.
+    """
+    path = path or settings.EMBEDDING_CACHE_PATH
+    if not path:
+        return
+    entries = embedding_cache.snapshot()
+    if not entries:
+        return
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.npy.tmp", "wb") as f:
+            np.save(f, np.stack([value for _, _, value in entries]))
+        with open(f"{path}.json.tmp", "wb") as f:
+            f.write(orjson.dumps({key: [row, age] for row, (key, age, _) in enumerate(entries)}))
+        os.replace(f"{path}.npy.tmp", f"{path}.npy")
+        os.replace(f"{path}.json.tmp", f"{path}.json")
+        logger.info(f"[Cache] Saved {len(entries)} embeddings to {path}.npy")
+    except Exception as e:
+        logger.warning(f"[Cache] Could not save embedding cache: {e}")
+
+
+def load_embedding_cache(path: str = None):
+    """Restores a snapshot written by save_embedding_cache; rows stay memory-mapped and are paged in on use"""
+    path = path or settings.EMBEDDING_CACHE_PATH
+    if not path or not os.path.exists(f"{path}.npy") or not os.path.exists(f"{path}.json"):
+        return
+    try:
+        matrix = np.load(f"{path}.npy", mmap_mode="r")
+        with open(f"{path}.json", "rb") as f:
+            index = orjson.loads(f.read())
+        embedding_cache.restore((key, age, matrix[row]) for key, (row, age) in index.items())
+        logger.info(f"[Cache] Loaded {len(index)} embeddings from {path}.npy")
+    except Exception as e:
+        logger.warning(f"[Cache] Could not load embedding cache: {e}")
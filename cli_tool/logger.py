@@ -1,7 +1,22 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 
+
+class _BufferedFileHandler(logging.StreamHandler):
+    """Writes into a 64 KiB file buffer; only ERROR and above force a flush (the rest go out when it fills or at exit)"""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
 def setup_logger():
     """Configures and returns the logger for the CLI tool."""
     
@@ -18,12 +33,18 @@ def setup_logger():
     if logger.hasHandlers():
         return logger
 
-    # File Handler
-    file_handler = logging.FileHandler(log_file)
+    # File Handler (runs on a QueueListener thread, so log calls never touch the disk)
+    file_handler = _BufferedFileHandler(open(log_file, "a", buffering=65536))
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
 
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(file_handler.close)
+    atexit.register(listener.stop)  # Runs first (LIFO): drain the queue, then flush and close the file
+
     # Console Handler (Optional, maybe we only want errors or concise info on console to not clutter chat)
     # The requirement said "chat interface", so we probably shouldn't log EVERYTHING to console, 
     # but maybe just errors or app startup info.
@@ -33,7 +54,7 @@ def setup_logger():
     console_formatter = logging.Formatter('[LOG] %(message)s')
     console_handler.setFormatter(console_formatter)
 
-    logger.addHandler(file_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     # logger.addHandler(console_handler) # Commented out console logging to avoid cluttering the chat UI
 
     return logger
@@ -1,28 +1,49 @@
+from __future__ import annotations
+
 import asyncio
 import sys
 import logging
-from app.services.rag import rag_service
-from app.models.schemas import ChatResponse
+import threading
+from typing import TYPE_CHECKING
 from cli_tool.logger import logger
 
+# The backend stack (Qdrant, Gemini clients, settings) is imported on the first query,
+# so the banner, 'quit' and Ctrl+C don't wait on it
+if TYPE_CHECKING:
+    from app.models.schemas import ChatResponse
+
 # Configure logging to be less verbose for the chat interface
 logging.getLogger("httpx").setLevel(logging.WARNING)
+# Transport libraries log per request/frame at DEBUG (h2/hpack once HTTP/2 is on)
+for name in ("httpcore", "httpcore.http11", "httpcore.http2", "hpack", "h2"):
+    logging.getLogger(name).setLevel(logging.WARNING)
 
-def print_separator(char="=", length=50):
-    print(char * length)
+# Banner strings, built once rather than on every response
+EQ20 = "=" * 20
+DASH30 = "-" * 30
+DASH20 = "-" * 20
+SEP50 = "=" * 50
+COUNCIL_HDR = f"\n{EQ20} COUNCIL OPINIONS {EQ20}\n"
+RULING_HDR = f"\n{EQ20} CHAIRMAN'S RULING {EQ20}\n"
+SOURCES_HDR = f"\n{DASH20} Sources (Indian Kanoon) {DASH20}\n"
+
+def _preview(text: str, n: int = 150) -> str:
+    """First n chars of a source, with an ellipsis only when something was cut"""
+    return text if len(text) <= n else text[:n] + "..."
 
 def print_response(data: ChatResponse):
-    """Pretty prints the chat response matches test_council.py style."""
+    """Pretty prints the chat response matches test_council.py style (built up, then written in one go)."""
     if not data:
         return
 
     answer = data.answer
     chunks = data.chunks
     council = data.council_opinions
+    parts = []
     
     # 1. Council Opinions
     if council:
-        print("\n" + "="*20 + " COUNCIL OPINIONS " + "="*20)
+        parts.append(COUNCIL_HDR)
         for opinion in council:
             role = opinion.get("role", "Unknown")
             model = opinion.get("model", "Unknown")
@@ -30,39 +51,67 @@ def print_response(data: ChatResponse):
             
             # Check for Special Power (Direct Ruling) tag in opinions (though usually Chairman handles it)
             # But here we just print what the council said.
-            print(f"\n[{role}] ({model}):")
-            print("-" * 30)
-            print(text.strip())
-            print("-" * 30)
+            parts.append(f"\n[{role}] ({model}):\n")
+            parts.append(f"{DASH30}\n")
+            parts.append(text.strip() + "\n")
+            parts.append(f"{DASH30}\n")
     
     # 2. Chairman's Ruling
-    print("\n" + "="*20 + " CHAIRMAN'S RULING " + "="*20)
-    print(f"{answer}")
-    print("="*50)
+    parts.append(RULING_HDR)
+    parts.append(f"{answer}\n")
+    parts.append(f"{SEP50}\n")
     
     # 3. Sources
     if chunks:
-        print("\n" + "-"*20 + " Sources (Indian Kanoon) " + "-"*20)
+        parts.append(SOURCES_HDR)
         for i, chunk in enumerate(chunks, 1):
-            text = chunk.text.strip()
             # print first 150 chars of source
-            preview = text[:150] + "..." if len(text) > 150 else text
-            print(f"  {i}. {preview}")
+            parts.append(f"  {i}. {_preview(chunk.text.strip())}\n")
             if chunk.metadata:
-                 print(f"     (Metadata: {chunk.metadata})")
-    print("\n")
+                 parts.append(f"     (Metadata: {chunk.metadata})\n")
+    parts.append("\n\n")
+
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+async def ainput(prompt: str) -> str:
+    """
+    input() on a daemon thread so the event loop keeps running while the user types.
+    (Not the default executor: asyncio.run would wait on a thread stuck in input() after Ctrl+C.)
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def deliver(method, value):
+        if not future.done():
+            method(value)
+
+    def read():
+        try:
+            result = input(prompt)
+        except BaseException as e:  # EOFError / KeyboardInterrupt are re-raised in the loop
+            method, value = future.set_exception, e
+        else:
+            method, value = future.set_result, result
+        try:
+            loop.call_soon_threadsafe(deliver, method, value)
+        except RuntimeError:
+            pass  # Loop already closed
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
 
 async def chat_loop():
     """Main interactive chat loop."""
-    print_separator()
+    print(SEP50)
     print("AI LAWYER COUNCIL - CLI INTERFACE")
     print("Direct Connection to Gemini 2.0 Backend")
-    print_separator()
+    print(SEP50)
     print("Type 'exit', 'quit', or 'q' to end the session.\n")
     
     while True:
         try:
-            user_input = input("YOU: ").strip()
+            user_input = (await ainput("YOU: ")).strip()
         except EOFError:
             break
             
@@ -77,6 +126,8 @@ async def chat_loop():
         print("Thinking...", end = "\r")
         
         try:
+            from app.services.rag import rag_service
+
             # DIRECT SERVICE CALL (No HTTP)
             response = await rag_service.process_query(user_input)
             
@@ -85,13 +136,25 @@ async def chat_loop():
             
         except Exception as e:
             print(f"\n[ERROR] Processing failed: {e}")
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
 
     print("Session ended.")
 
+async def run():
+    """Runs the chat loop, then closes the services' pooled HTTP clients while the loop is still alive"""
+    try:
+        await chat_loop()
+    finally:
+        if "app.services.rag" in sys.modules:  # Nothing was opened if no query was sent
+            from app.services.council import council_service
+            from app.services.qdrant import qdrant_service
+
+            await council_service.close()
+            await qdrant_service.close()
+
 def main():
     try:
-        asyncio.run(chat_loop())
+        asyncio.run(run())
     except KeyboardInterrupt:
         print("\nGoodbye!")
 
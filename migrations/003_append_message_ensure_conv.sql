@@ -0,0 +1,61 @@
+-- Migration: One round-trip message writes + server-side updated_at
+-- Run this in your Supabase SQL Editor
+
+-- 1. Insert a message, creating its conversation first if it does not exist yet.
+--    p_created_at comes from the app, which also stamps batched assistant replies, so a turn's rows
+--    share one clock (falls back to the database clock when omitted).
+DROP FUNCTION IF EXISTS public.append_message_ensure_conv(uuid, uuid, text, text, text, jsonb);
+CREATE OR REPLACE FUNCTION public.append_message_ensure_conv(
+    p_user_id uuid,
+    p_conv_id uuid,
+    p_title text,
+    p_role text,
+    p_content text,
+    p_metadata jsonb DEFAULT '{}'::jsonb,
+    p_created_at timestamptz DEFAULT NULL
+) RETURNS uuid
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_message_id uuid;
+BEGIN
+    INSERT INTO public.conversations (id, user_id, title)
+    VALUES (p_conv_id, p_user_id, COALESCE(p_title, 'New Conversation'))
+    ON CONFLICT (id) DO NOTHING;
+
+    -- Never append to someone else's conversation
+    IF NOT EXISTS (
+        SELECT 1 FROM public.conversations
+        WHERE id = p_conv_id AND user_id = p_user_id
+    ) THEN
+        RAISE EXCEPTION 'Conversation % does not belong to user %', p_conv_id, p_user_id;
+    END IF;
+
+    INSERT INTO public.messages (conversation_id, user_id, role, content, metadata, created_at)
+    VALUES (p_conv_id, p_user_id, p_role, p_content, COALESCE(p_metadata, '{}'::jsonb), COALESCE(p_created_at, timezone('utc'::text, now())))
+    RETURNING id INTO v_message_id;
+
+    RETURN v_message_id;
+END;
+$$;
+
+-- 2. Stamp conversations.updated_at on the database clock when the conversation is renamed.
+--    Scoped to title so pin toggles and soft deletes don't reorder the sidebar (sorted by updated_at);
+--    the function name is table-specific so it cannot replace an existing generic helper.
+CREATE OR REPLACE FUNCTION public.conversations_set_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.updated_at = timezone('utc'::text, now());
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS conversations_set_updated_at ON public.conversations;
+CREATE TRIGGER conversations_set_updated_at
+    BEFORE UPDATE OF title ON public.conversations
+    FOR EACH ROW EXECUTE FUNCTION public.conversations_set_updated_at();
+
+-- Verification query (run separately to check):
+-- SELECT public.append_message_ensure_conv('<user uuid>', gen_random_uuid(), 'Test', 'user', 'Hello');
@@ -16,31 +16,32 @@ except ImportError:
 from app.services.council import council_service
 from app.config import settings
 
-async def test_modes():
-    print("\n=== Testing FAST Mode (Single Pass) ===")
+async def run_mode(mode: str) -> list:
+    """Streams one mode and collects its report lines (printed later, so concurrent modes don't interleave)"""
+    lines = []
     try:
         async for chunk in council_service.deliberate_stream(
             query="What is theft under IPC?", 
-            mode="fast", 
+            mode=mode, 
             enable_web_search=False
         ):
-            if "log:" in chunk: print(chunk.strip())
+            if "log:" in chunk: lines.append(chunk.strip())
             # Don't print tokens to keep output clean, rely on followup check
-            if "followup:" in chunk: print(f"\n[SUCCESS] FOLLOWUP EVENT: {chunk.strip()}")
+            if "followup:" in chunk: lines.append(f"\n[SUCCESS] FOLLOWUP EVENT: {chunk.strip()}")
             if settings.FOLLOWUP_SEPARATOR in chunk:
-                 print("\n[FAILURE] SEPARATOR LEAKED INTO STREAM!")
-    except Exception as e: print(f"Fast Mode Error: {e}")
+                 lines.append("\n[FAILURE] SEPARATOR LEAKED INTO STREAM!")
+    except Exception as e: lines.append(f"{mode.capitalize()} Mode Error: {e}")
+    return lines
+
+async def test_modes():
+    # Both modes are independent LLM round-trips: run them concurrently
+    fast, balanced = await asyncio.gather(run_mode("fast"), run_mode("balanced"))
+
+    print("\n=== Testing FAST Mode (Single Pass) ===")
+    print("\n".join(fast))
 
     print("\n\n=== Testing BALANCED Mode (Single Pass) ===")
-    try:
-        async for chunk in council_service.deliberate_stream(
-            query="What is theft under IPC?", 
-            mode="balanced", 
-            enable_web_search=False
-        ):
-            if "log:" in chunk: print(chunk.strip())
-            if "followup:" in chunk: print(f"\n[SUCCESS] FOLLOWUP EVENT: {chunk.strip()}")
-    except Exception as e: print(f"Balanced Mode Error: {e}")
+    print("\n".join(balanced))
 
 if __name__ == "__main__":
     if not settings.GEMINI_API_KEY:
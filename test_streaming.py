@@ -2,6 +2,17 @@ import httpx
 import asyncio
 import json
 
+# Shared client so repeated test_stream() runs reuse the pooled connection
+client = httpx.AsyncClient(timeout=60.0, limits=httpx.Limits(max_keepalive_connections=20))
+
+# SSE event prefix -> printer (prefixes are disjoint and end at ':')
+HANDLERS = {
+    "token": lambda v: print(f"[TOKEN] {v}"),
+    "followup": lambda v: print(f"[FOLLOWUP] {v}"),
+    "data": lambda v: print(f"[DATA] {v}"),
+    "log": lambda v: None,  # print(f"[LOG] {v}")
+}
+
 async def test_stream():
     url = "http://localhost:8000/api/stream"
     params = {
@@ -12,21 +23,21 @@ async def test_stream():
     
     print(f"Connecting to {url}...")
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            async with client.stream("GET", url, params=params) as response:
-                print(f"Status: {response.status_code}")
-                async for line in response.aiter_lines():
-                    if line.startswith("token:"):
-                        print(f"[TOKEN] {line[6:]}")
-                    elif line.startswith("followup:"):
-                        print(f"[FOLLOWUP] {line[9:]}")
-                    elif line.startswith("data:"):
-                        print(f"[DATA] {line[5:]}")
-                    elif line.startswith("log:"):
-                        # print(f"[LOG] {line[4:]}")
-                        pass
+        async with client.stream("GET", url, params=params) as response:
+            print(f"Status: {response.status_code}")
+            async for line in response.aiter_lines():
+                event, _, value = line.partition(":")
+                handler = HANDLERS.get(event)
+                if handler:
+                    handler(value)
     except Exception as e:
         print(f"Error: {e}")
 
+async def main():
+    try:
+        await test_stream()
+    finally:
+        await client.aclose()
+
 if __name__ == "__main__":
-    asyncio.run(test_stream())
+    asyncio.run(main())
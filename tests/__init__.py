@@ -0,0 +1,12 @@
+import os
+
+# app.config requires these; the tests never reach the real services
+for name, value in {
+    "QDRANT_URL": "http://localhost:6333",
+    "QDRANT_API_KEY": "test",
+    "GEMINI_API_KEY": "test",
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_SERVICE_KEY": "test.test.test",
+    "EMBEDDING_CACHE_PATH": "",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,194 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from app.config import settings
+from app.services import council
+from app.services.clerk import IntentType
+from app.services.council import CouncilService
+
+CHUNK = {"text": "Bail is the rule.", "score": 0.5, "metadata": {"source_type": "statute", "law": "CrPC", "section_number": "437"}}
+
+
+class ClerkDecision:
+    is_legal = True
+    rewritten_query = "what is bail"
+    search_intents = [IntentType.SEARCH_BOTH]
+    direct_answer = None
+
+
+class CouncilHarness:
+    """A CouncilService whose members and Chairman are fakes with scripted latencies"""
+
+    def __init__(self, member_delays, chairman_delay, opinions=None):
+        self.service = CouncilService()
+        self.member_delays = member_delays
+        self.chairman_delay = chairman_delay
+        self.opinions = opinions or {}
+        self.chairman_calls = []  # Opinions per Chairman call
+        self.cancelled = []  # Members and Chairman calls that were cancelled
+        self.service._get_member_opinion = self.member
+        self.service._generate_and_stream_response = self.chairman
+
+    async def member(self, role, model, system_prompt, user_query, context, enable_search):
+        try:
+            await asyncio.sleep(self.member_delays[role])
+        except asyncio.CancelledError:
+            self.cancelled.append(role)
+            raise
+        return {"role": role, "model": model, "opinion": self.opinions.get(role, "Bail is the rule and jail the exception."), "web_search_enabled": enable_search}
+
+    async def chairman(self, model, system_prompt, user_prompt, enable_search):
+        call = len(self.chairman_calls)
+        self.chairman_calls.append(user_prompt.count("=== OPINION FROM"))
+        try:
+            await asyncio.sleep(self.chairman_delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(f"chairman#{call}")
+            raise
+        yield 'token: "ruling"\n'
+        yield 'data: {"answer": "ruling"}\n'
+
+    def stream(self):
+        return self.service.deliberate_stream("what is bail", mode="research")
+
+
+class DeliberateStreamTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        async def classify(*args, **kwargs):
+            return ClerkDecision()
+
+        async def search(query, top_k=None):
+            return [CHUNK], [dict(CHUNK, metadata={"source_type": "case_law", "case_name": "State v. X"})]
+
+        for patcher in (
+            mock.patch.object(council.clerk_service, "classify_and_route", classify),
+            mock.patch.object(council.qdrant_service, "asearch_statutes_and_cases", search),
+            mock.patch.object(settings, "COUNCIL_SPECULATIVE_CHAIRMAN", True),
+            mock.patch.object(settings, "COUNCIL_SPECULATION_DEFAULT_DELAY", 0.0),
+            mock.patch.object(settings, "COUNCIL_DEVIL_SKIP_SIMILARITY", 0.85),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def assert_no_tasks_left(self):
+        await asyncio.sleep(0.05)
+        left = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(left, [])
+
+    async def test_late_opinion_reissues_speculative_chairman(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 0.15},
+            chairman_delay=0.3,
+        )
+        events = [event async for event in harness.stream()]
+        # Started on the quorum of two, then re-issued once the third opinion arrived before it spoke
+        self.assertEqual(harness.chairman_calls, [2, 3])
+        self.assertIn("chairman#0", harness.cancelled)
+        self.assertIn('data: {"answer": "ruling"}\n', events)
+        self.assertEqual(sum(event.startswith("data:") for event in events), 1)
+        await self.assert_no_tasks_left()
+
+    async def test_streaming_chairman_dismisses_late_member(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 1.0},
+            chairman_delay=0.05,
+        )
+        events = [event async for event in harness.stream()]
+        self.assertEqual(harness.chairman_calls, [2])
+        self.assertIn("log: Proceeding without 1 late member(s)\n", events)
+        await self.assert_no_tasks_left()
+        self.assertIn("Case Law Researcher", harness.cancelled)
+
+    async def test_devil_advocate_skipped_when_opinions_agree(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 0.03, "Devil's Advocate": 0.01},
+            chairman_delay=0.2,
+        )
+        events = [event async for event in harness.stream()]
+        self.assertIn(council._LOG_DEVIL_SKIPPED, events)
+        self.assertNotIn(council._LOG_MEMBER_DEVIL, events)
+        self.assertEqual(harness.chairman_calls[-1], 3)
+
+    async def test_devil_advocate_joins_when_opinions_diverge(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 0.03, "Devil's Advocate": 0.05},
+            chairman_delay=0.2,
+            opinions={"Constitutional Expert": "Article 21 protects personal liberty.", "Statutory Analyst": "Section 437 lists conditions for release."},
+        )
+        events = [event async for event in harness.stream()]
+        self.assertIn(council._LOG_MEMBER_DEVIL, events)
+        # The Chairman never speculates past a pending Devil's Advocate
+        self.assertEqual(harness.chairman_calls[-1], 4)
+
+    async def test_disconnect_cancels_members_and_speculative_chairman(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 0.15, "Devil's Advocate": 1.0},
+            chairman_delay=1.0,
+            opinions={"Constitutional Expert": "Article 21 protects personal liberty.", "Statutory Analyst": "Section 437 lists conditions for release."},
+        )
+        stream = harness.stream()
+        async for event in stream:
+            if event.startswith("opinion:") and "Case Law Researcher" in event:
+                break  # Client goes away while the Devil's Advocate is still deliberating
+        await stream.aclose()
+        await self.assert_no_tasks_left()
+        self.assertIn("Devil's Advocate", harness.cancelled)
+
+    async def test_disconnect_during_ruling_cancels_chairman(self):
+        harness = CouncilHarness(
+            {"Constitutional Expert": 0.01, "Statutory Analyst": 0.02, "Case Law Researcher": 0.03},
+            chairman_delay=0.05,
+        )
+        stream = harness.stream()
+        async for event in stream:
+            if event == council._LOG_FINAL_RULING:
+                break
+        await stream.aclose()
+        await self.assert_no_tasks_left()
+
+
+class InflightCoalescingTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = CouncilService()
+        self.requests = []
+
+        async def request(model, system_prompt, user_query, enable_search, timeout):
+            self.requests.append(user_query)
+            await asyncio.sleep(0.05)
+            return f"answer to {user_query}"
+
+        self.service._request_gemini = request
+
+    async def test_identical_calls_share_one_request(self):
+        results = await asyncio.gather(*(self.service._call_gemini("m", "s", "q") for _ in range(3)))
+        self.assertEqual(results, ["answer to q"] * 3)
+        self.assertEqual(self.requests, ["q"])
+        self.assertEqual(self.service._inflight, {})
+
+    async def test_different_calls_are_not_coalesced(self):
+        await asyncio.gather(self.service._call_gemini("m", "s", "q1"), self.service._call_gemini("m", "s", "q2"))
+        self.assertEqual(sorted(self.requests), ["q1", "q2"])
+
+    async def test_cancelled_waiter_does_not_cancel_the_others(self):
+        first = asyncio.create_task(self.service._call_gemini("m", "s", "q"))
+        second = asyncio.create_task(self.service._call_gemini("m", "s", "q"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        self.assertEqual(await second, "answer to q")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.requests, ["q"])
+
+    async def test_request_cancelled_when_every_waiter_leaves(self):
+        waiter = asyncio.create_task(self.service._call_gemini("m", "s", "q"))
+        await asyncio.sleep(0.01)
+        (request, _), = self.service._inflight.values()
+        waiter.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        self.assertTrue(request.cancelled())
+        self.assertEqual(self.service._inflight, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import threading
+import unittest
+from unittest import mock
+
+from app.config import settings
+from app.services import db
+from app.services.db import DatabaseService
+
+
+class FakeTable:
+    """Records inserts; batches containing a `bad` row fail like a foreign-key violation"""
+
+    def __init__(self):
+        self.inserts = []
+        self.rows = []
+        self._rows = None
+
+    def insert(self, rows):
+        self._rows = rows
+        return self
+
+    def execute(self):
+        self.inserts.append(len(self._rows))
+        if any(row["content"] == "bad" for row in self._rows):
+            raise RuntimeError("insert or update on table violates foreign key constraint")
+        self.rows.extend(self._rows)
+
+
+class BatchedWriterTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(db, "create_client", return_value=mock.Mock()):
+            self.service = DatabaseService()
+        self.table = FakeTable()
+        self.service.supabase.table.return_value = self.table
+        for patcher in (
+            mock.patch.object(settings, "DB_WRITE_BATCH_SIZE", 10),
+            mock.patch.object(settings, "DB_WRITE_BATCH_MS", 1000),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        for content in ("a", "bad", "b"):
+            self.service.enqueue_message("c1", "u1", "assistant", content)
+        self.service.flush_messages()
+        self.assertEqual(self.table.inserts, [3, 1, 1, 1])
+        self.assertEqual([row["content"] for row in self.table.rows], ["a", "b"])
+        # The failed row is given up on, not left pending forever
+        self.assertFalse(self.service.has_queued_messages("c1"))
+
+    def test_created_at_strictly_increases_per_conversation(self):
+        with mock.patch.object(db.time, "time_ns", return_value=1_700_000_000_000_000_000):
+            stamps = [self.service._next_created_at("c1") for _ in range(3)]
+            other = self.service._next_created_at("c2")
+        self.assertEqual(stamps, sorted(set(stamps)))
+        self.assertEqual(stamps[0], "2023-11-14T22:13:20.000000+00:00")
+        self.assertEqual(stamps[2], "2023-11-14T22:13:20.000002+00:00")
+        self.assertEqual(other, stamps[0])
+
+    def test_created_at_tracking_is_bounded(self):
+        with mock.patch.object(settings, "DB_CREATED_AT_TRACK_MAX", 2):
+            for conversation_id in ("c1", "c2", "c1", "c3"):
+                self.service._next_created_at(conversation_id)
+        self.assertEqual(list(self.service._last_created_at), ["c1", "c3"])
+
+    def test_wait_for_queued_messages(self):
+        release = threading.Event()
+        execute = self.table.execute
+        self.table.execute = lambda: (release.wait(5), execute())[1]
+
+        self.service.enqueue_message("c1", "u1", "assistant", "a")
+        self.assertTrue(self.service.has_queued_messages("c1"))
+        self.assertFalse(self.service.wait_for_queued_messages("c1", timeout=0.1))
+        release.set()
+        self.assertTrue(self.service.wait_for_queued_messages("c1", timeout=5))
+        self.assertEqual([row["content"] for row in self.table.rows], ["a"])
+        self.service.flush_messages()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from app.services import retrieval_cache
+from app.services.retrieval_cache import QueryCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class QueryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(retrieval_cache, "time", SimpleNamespace(monotonic=self.clock.monotonic))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit_and_miss_are_counted(self):
+        cache = QueryCache(max_size=4, ttl_seconds=60)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", [1])
+        self.assertEqual(cache.get("a"), [1])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_entries_expire_after_ttl(self):
+        cache = QueryCache(max_size=4, ttl_seconds=60)
+        cache.set("a", [1])
+        self.clock.now += 60
+        self.assertEqual(cache.get("a"), [1])
+        self.clock.now += 1
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = QueryCache(max_size=2, ttl_seconds=60)
+        cache.set("a", [1])
+        cache.set("b", [2])
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("c", [3])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), [1])
+        self.assertEqual(cache.get("c"), [3])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_get_or_compute_does_not_cache_empty_results(self):
+        cache = QueryCache(max_size=4, ttl_seconds=60)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return []
+
+        cache.get_or_compute("a", compute)
+        cache.get_or_compute("a", compute)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.get_or_compute("b", lambda: [1]), [1])
+        self.assertEqual(cache.get_or_compute("b", lambda: self.fail("recomputed")), [1])
+
+    def test_snapshot_restore_keeps_age_and_drops_expired(self):
+        cache = QueryCache(max_size=4, ttl_seconds=60)
+        cache.set("old", [1])
+        self.clock.now += 50
+        cache.set("new", [2])
+        entries = cache.snapshot()
+        self.assertEqual([key for key, _, _ in entries], ["old", "new"])
+
+        restored = QueryCache(max_size=4, ttl_seconds=60)
+        self.clock.now += 500  # Downtime between snapshot and restore does not age the entries
+        restored.restore(entries)
+        self.clock.now += 11  # "old" is now 61s old, "new" 11s
+        self.assertIsNone(restored.get("old"))
+        self.assertEqual(restored.get("new"), [2])
+
+        restored.restore([("stale", 61, [3])])
+        self.assertIsNone(restored.get("stale"))
+
+    def test_restore_respects_max_size(self):
+        cache = QueryCache(max_size=2, ttl_seconds=60)
+        cache.restore([("a", 3, [1]), ("b", 2, [2]), ("c", 1, [3])])
+        self.assertEqual([key for key, _, _ in cache.snapshot()], ["b", "c"])
+
+
+class EmbeddingSnapshotTest(unittest.TestCase):
+    def test_save_and_load_round_trip(self):
+        original = retrieval_cache.embedding_cache
+        self.addCleanup(setattr, retrieval_cache, "embedding_cache", original)
+        retrieval_cache.embedding_cache = QueryCache(max_size=8, ttl_seconds=3600)
+        vectors = {f"k{i}": np.random.rand(16).astype(np.float16) for i in range(3)}
+        for key, vector in vectors.items():
+            retrieval_cache.embedding_cache.set(key, vector)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache")
+            retrieval_cache.save_embedding_cache(path)
+            retrieval_cache.embedding_cache = QueryCache(max_size=8, ttl_seconds=3600)
+            retrieval_cache.load_embedding_cache(path)
+            for key, vector in vectors.items():
+                np.testing.assert_array_equal(np.asarray(retrieval_cache.embedding_cache.get(key)), vector)
+
+    def test_load_without_snapshot_is_a_no_op(self):
+        with tempfile.TemporaryDirectory() as directory:
+            retrieval_cache.load_embedding_cache(os.path.join(directory, "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from unittest import mock
+
+import orjson
+
+from app.config import settings
+from app.services.council import CouncilService, _decode_escaped, _escaped_cut, _extract_stream_text
+
+TEXTS = ['Hello "world"\n', "ünï\\code ✓  ", "😀 end"]
+
+
+def _frame(text: str) -> bytes:
+    return b"data: " + orjson.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}) + b"\r\n\r\n"
+
+
+SSE_BODY = b"".join(_frame(text) for text in TEXTS)
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    async def aiter_bytes(self, chunk_size):
+        for piece in self.pieces:
+            yield piece
+
+
+class FakeStream:
+    def __init__(self, pieces):
+        self.response = FakeResponse(pieces)
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeClient:
+    def __init__(self, pieces):
+        self.pieces = pieces
+
+    def stream(self, *args, **kwargs):
+        return FakeStream(self.pieces)
+
+
+class EscapeHelpersTest(unittest.TestCase):
+    def test_extract_stream_text(self):
+        frame = orjson.dumps({"candidates": [{"content": {"parts": [{"text": 'a "b" ü'}]}}]})
+        self.assertEqual(_extract_stream_text(frame), 'a "b" ü')
+        self.assertEqual(_extract_stream_text(frame, raw=True), orjson.dumps('a "b" ü')[1:-1])
+        self.assertEqual(_extract_stream_text(b"{not json"), "")
+
+    def test_escaped_cut_never_splits_escapes_surrogates_or_utf8(self):
+        # Gemini escapes non-BMP characters as surrogate pairs; \\\\ud83d is an escaped backslash, not a surrogate
+        body = b'ok \\ud83d\\ude00 and \\"q\\" \\\\ud83d done \xc3\xa9\\n'
+        for cut in range(len(body) + 1):
+            head = body[:_escaped_cut(body, cut)]
+            self.assertEqual(orjson.loads(b'"' + head + b'"') + orjson.loads(b'"' + body[len(head):] + b'"'),
+                             orjson.loads(b'"' + body + b'"'), cut)
+
+    def test_cut_before_low_surrogate_keeps_pair_together(self):
+        body = b"ok \\ud83d\\ude00"
+        self.assertEqual(_escaped_cut(body, body.index(b"\\ude00")), 3)
+
+    def test_decode_escaped_drops_truncated_escape(self):
+        self.assertEqual(_decode_escaped(b"ok \\ud83d\\ude00"), "ok 😀")
+        self.assertEqual(_decode_escaped(b"ok \\ud83d"), "ok ")
+        self.assertEqual(_decode_escaped(b"ok \\u00"), "ok ")
+
+
+class StreamCallSplittingTest(unittest.IsolatedAsyncioTestCase):
+    async def _collect(self, pieces, raw=False):
+        service = CouncilService()
+        service._client = FakeClient(pieces)
+        return [chunk async for chunk in service._stream_call_gemini("model", "system", "query", raw=raw)]
+
+    async def test_frames_split_at_every_byte(self):
+        for split in range(1, len(SSE_BODY)):
+            self.assertEqual(await self._collect([SSE_BODY[:split], SSE_BODY[split:]]), TEXTS, split)
+
+    async def test_frames_split_into_single_bytes(self):
+        pieces = [SSE_BODY[i:i + 1] for i in range(len(SSE_BODY))]
+        self.assertEqual(await self._collect(pieces), TEXTS)
+
+    async def test_last_frame_without_trailing_newline(self):
+        self.assertEqual(await self._collect([SSE_BODY.rstrip()]), TEXTS)
+
+    async def test_raw_chunks_stay_escaped(self):
+        self.assertEqual(await self._collect([SSE_BODY[:7], SSE_BODY[7:]], raw=True),
+                         [orjson.dumps(text)[1:-1] for text in TEXTS])
+
+
+class FollowupSplitterTest(unittest.IsolatedAsyncioTestCase):
+    """_generate_and_stream_response: token frames, separator detection and follow-ups across chunk boundaries"""
+
+    ANSWER = 'Bail is "a right" 😀 under §437.\n'
+    QUESTIONS = ["What is anticipatory bail?", "Who can grant bail?"]
+
+    async def _run(self, pieces):
+        service = CouncilService()
+
+        async def fake_stream(*args, **kwargs):
+            for piece in pieces:
+                yield piece
+
+        service._stream_call_gemini = fake_stream
+        return [event async for event in service._generate_and_stream_response("model", "system", "user", False)]
+
+    def _raw_body(self) -> bytes:
+        text = self.ANSWER + settings.FOLLOWUP_SEPARATOR + "\n" + "\n".join(f"{i}. {q}" for i, q in enumerate(self.QUESTIONS, 1))
+        # Escape non-BMP characters as surrogate pairs, as Gemini does
+        return orjson.dumps(text)[1:-1].replace("😀".encode(), b"\\ud83d\\ude00")
+
+    async def test_every_split_point(self):
+        body = self._raw_body()
+        with mock.patch.object(settings, "STREAM_FLUSH_CHARS", 1):
+            for split in range(1, len(body)):
+                events = await self._run([body[:split], body[split:]])
+                tokens = [orjson.loads(event[len("token: "):]) for event in events if event.startswith("token: ")]
+                self.assertEqual("".join(tokens), self.ANSWER, split)
+                followups = [event for event in events if event.startswith("followup: ")]
+                self.assertEqual(orjson.loads(followups[0][len("followup: "):]), self.QUESTIONS, split)
+                self.assertEqual(orjson.loads(events[-1][len("data: "):]), {"answer": self.ANSWER}, split)
+
+    async def test_missing_separator_flushes_everything(self):
+        body = orjson.dumps(self.ANSWER)[1:-1]
+        events = await self._run([body[:5], body[5:]])
+        tokens = [orjson.loads(event[len("token: "):]) for event in events if event.startswith("token: ")]
+        self.assertEqual("".join(tokens), self.ANSWER)
+        self.assertFalse(any(event.startswith("followup: ") for event in events))
+
+
+if __name__ == "__main__":
+    unittest.main()